@@ -1,61 +1,119 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
 import plotly.graph_objects as go
-import plotly.express as px
 from datetime import datetime, timedelta
 import yfinance as yf
 from utils.market_data import get_nifty_data, get_top_gainers_losers
 from utils.fundamentals import get_fundamental_data
 from utils.ai_analysis import get_market_sentiment_analysis
 from utils.news_scraper import get_financial_news
-import threading
-import time
+from utils._njit import njit
 
 # ──────────────────────────────────────────────────────────────
 # 🔧 ADVANCED TECHNICAL INDICATORS
 # ──────────────────────────────────────────────────────────────
 
+def _roll_min(a, w):
+    """Trailing rolling minimum over a dense array (NaN until the window fills)"""
+    out = np.full(len(a), np.nan)
+    if len(a) >= w:
+        out[w - 1:] = sliding_window_view(a, w).min(axis=-1)
+    return out
+
+def _roll_max(a, w):
+    """Trailing rolling maximum over a dense array (NaN until the window fills)"""
+    out = np.full(len(a), np.nan)
+    if len(a) >= w:
+        out[w - 1:] = sliding_window_view(a, w).max(axis=-1)
+    return out
+
+@njit(cache=True)
+def _supertrend_loop(flip_up, flip_dn, upper, lower, st_out, dir_out):
+    """Carry the Supertrend state over precomputed band breaks (index 0 is seeded by caller)"""
+    in_uptrend = True
+    for i in range(1, len(upper)):
+        in_uptrend = flip_up[i] or (in_uptrend and not flip_dn[i])
+        st_out[i] = lower[i] if in_uptrend else upper[i]
+        dir_out[i] = 1 if in_uptrend else -1
+
 def supertrend(df, period=10, multiplier=3):
     """Calculate Supertrend indicator"""
-    hl2 = (df['High'] + df['Low']) / 2
-    atr = df['High'].rolling(window=period).max() - df['Low'].rolling(window=period).min()
-    atr = atr.rolling(window=period).mean()
+    high = df['High']
+    low = df['Low']
+    prev_close = df['Close'].shift()
+    hl2 = (high + low) / 2
+
+    # True range: widest of the bar range and the gaps from the previous close
+    true_range = np.fmax.reduce([(high - low).to_numpy(),
+                                 (high - prev_close).abs().to_numpy(),
+                                 (low - prev_close).abs().to_numpy()])
+    atr = pd.Series(true_range, index=df.index).rolling(window=period).mean()
 
     upper_band = hl2 + multiplier * atr
     lower_band = hl2 - multiplier * atr
 
-    supertrend_values = []
-    trend_direction = []
-    in_uptrend = True
-
-    for i in range(len(df)):
-        if i == 0:
-            supertrend_values.append(hl2.iloc[i])
-            trend_direction.append(1)
-            continue
+    n = len(df)
+    supertrend_values = np.empty(n)
+    trend_direction = np.empty(n, dtype=np.int64)
+    if n:
+        supertrend_values[0] = hl2.iloc[0]
+        trend_direction[0] = 1
+        close = df['Close'].to_numpy()
+        upper = upper_band.to_numpy()
+        lower = lower_band.to_numpy()
+
+        # Band breaks are vectorized; only the trend state is carried in the loop
+        flip_up = np.zeros(n, dtype=np.bool_)
+        flip_dn = np.zeros(n, dtype=np.bool_)
+        flip_up[1:] = close[1:] > upper[:-1]
+        flip_dn[1:] = close[1:] < lower[:-1]
+        _supertrend_loop(flip_up, flip_dn, upper, lower, supertrend_values, trend_direction)
 
-        if df['Close'].iloc[i] > upper_band.iloc[i-1]:
-            in_uptrend = True
-        elif df['Close'].iloc[i] < lower_band.iloc[i-1]:
-            in_uptrend = False
+    return pd.Series(supertrend_values, index=df.index), pd.Series(trend_direction, index=df.index)
 
-        if in_uptrend:
-            supertrend_values.append(lower_band.iloc[i])
-            trend_direction.append(1)
+@njit(cache=True)
+def _bb_loop(c, w, k, sma, upper, lower):
+    """Running sum / sum-of-squares Bollinger pass (sample std, NaN while the window holds a NaN)"""
+    s = 0.0
+    s2 = 0.0
+    nans = 0
+    for i in range(len(c)):
+        if np.isnan(c[i]):
+            nans += 1
         else:
-            supertrend_values.append(upper_band.iloc[i])
-            trend_direction.append(-1)
-
-    return pd.Series(supertrend_values, index=df.index), pd.Series(trend_direction, index=df.index)
+            s += c[i]
+            s2 += c[i] * c[i]
+        if i >= w:
+            if np.isnan(c[i - w]):
+                nans -= 1
+            else:
+                s -= c[i - w]
+                s2 -= c[i - w] * c[i - w]
+        if i < w - 1 or nans > 0:
+            sma[i] = np.nan
+            upper[i] = np.nan
+            lower[i] = np.nan
+        else:
+            mean = s / w
+            var = (s2 - s * mean) / (w - 1)
+            std = np.sqrt(var) if var > 0.0 else 0.0
+            sma[i] = mean
+            upper[i] = mean + k * std
+            lower[i] = mean - k * std
 
 def bollinger_bands(close, window=20, num_std=2):
     """Calculate Bollinger Bands"""
-    sma = close.rolling(window=window).mean()
-    std = close.rolling(window=window).std()
-    upper_band = sma + (num_std * std)
-    lower_band = sma - (num_std * std)
-    return sma, upper_band, lower_band
+    n = len(close)
+    sma = np.empty(n)
+    upper_band = np.empty(n)
+    lower_band = np.empty(n)
+    # Running sums of squares need float64 input to avoid cancellation
+    _bb_loop(close.to_numpy(dtype=np.float64), window, float(num_std), sma, upper_band, lower_band)
+    return (pd.Series(sma, index=close.index),
+            pd.Series(upper_band, index=close.index),
+            pd.Series(lower_band, index=close.index))
 
 def rsi(close, window=14):
     """Calculate RSI"""
@@ -63,51 +121,97 @@ def rsi(close, window=14):
     gain = delta.where(delta > 0, 0)
     loss = -delta.where(delta < 0, 0)
 
-    avg_gain = gain.rolling(window=window).mean()
-    avg_loss = loss.rolling(window=window).mean()
+    # Wilder's smoothing
+    avg_gain = gain.ewm(alpha=1.0 / window, adjust=False, min_periods=window).mean()
+    avg_loss = loss.ewm(alpha=1.0 / window, adjust=False, min_periods=window).mean()
 
     rs = avg_gain / avg_loss
     rsi = 100 - (100 / (1 + rs))
     return rsi
 
+@njit(cache=True)
+def _fisher_loop(norm, fisher, signal):
+    """Fisher smoothing recurrence over a normalized price array"""
+    fisher[0] = 0.0
+    signal[0] = 0.0
+    for i in range(1, len(norm)):
+        value = 0.5 * np.log((1 + norm[i]) / (1 - norm[i]))
+        fisher[i] = 0.33 * value + 0.67 * fisher[i - 1]
+        signal[i] = fisher[i - 1]
+
 def fisher_transform(high, low, period=9):
     """Calculate Fisher Transform"""
     hl2 = (high + low) / 2
 
     # Normalize the values
-    highest = hl2.rolling(window=period).max()
-    lowest = hl2.rolling(window=period).min()
-
-    normalized = 2 * ((hl2 - lowest) / (highest - lowest)) - 1
-    normalized = normalized.fillna(0).clip(-0.999, 0.999)
-
-    fisher = pd.Series(index=high.index, dtype=float)
-    fisher_signal = pd.Series(index=high.index, dtype=float)
-
-    for i in range(len(normalized)):
-        if i == 0:
-            fisher.iloc[i] = 0
-            fisher_signal.iloc[i] = 0
+    hl2_values = hl2.to_numpy()
+    highest = _roll_max(hl2_values, period)
+    lowest = _roll_min(hl2_values, period)
+
+    # Flat or not-yet-filled windows (zero/NaN range) normalize to 0
+    price_range = highest - lowest
+    valid = price_range > 1e-12
+    normalized = np.where(valid,
+                          np.clip(2 * (hl2_values - lowest) / np.where(valid, price_range, 1.0) - 1,
+                                  -0.999, 0.999),
+                          0.0)
+
+    n = len(normalized)
+    fisher = np.empty(n)
+    fisher_signal = np.empty(n)
+    if n:
+        _fisher_loop(normalized, fisher, fisher_signal)
+
+    return pd.Series(fisher, index=high.index), pd.Series(fisher_signal, index=high.index)
+
+@njit(cache=True)
+def _macd_loop(c, fast, slow, signal, out_m, out_s, out_h):
+    """
+    Fused MACD pass using adjusted EMAs (same weighting as pandas ewm(span=...));
+    a NaN input only decays the existing weights, so each EMA carries its last value past it
+    """
+    d1 = 1.0 - 2.0 / (fast + 1)
+    d2 = 1.0 - 2.0 / (slow + 1)
+    d3 = 1.0 - 2.0 / (signal + 1)
+    num1 = den1 = num2 = den2 = num3 = den3 = 0.0
+    for i in range(len(c)):
+        if np.isnan(c[i]):
+            num1 *= d1
+            den1 *= d1
+            num2 *= d2
+            den2 *= d2
         else:
-            fisher_value = 0.5 * np.log((1 + normalized.iloc[i]) / (1 - normalized.iloc[i]))
-            fisher.iloc[i] = 0.33 * fisher_value + 0.67 * fisher.iloc[i-1]
-            fisher_signal.iloc[i] = fisher.iloc[i-1]
-
-    return fisher, fisher_signal
+            num1 = c[i] + d1 * num1
+            den1 = 1.0 + d1 * den1
+            num2 = c[i] + d2 * num2
+            den2 = 1.0 + d2 * den2
+        m = num1 / den1 - num2 / den2 if den1 > 0.0 else np.nan
+        if np.isnan(m):
+            num3 *= d3
+            den3 *= d3
+        else:
+            num3 = m + d3 * num3
+            den3 = 1.0 + d3 * den3
+        sig = num3 / den3 if den3 > 0.0 else np.nan
+        out_m[i] = m
+        out_s[i] = sig
+        out_h[i] = m - sig
 
 def macd(close, fast=12, slow=26, signal=9):
     """Calculate MACD"""
-    exp1 = close.ewm(span=fast).mean()
-    exp2 = close.ewm(span=slow).mean()
-    macd_line = exp1 - exp2
-    signal_line = macd_line.ewm(span=signal).mean()
-    histogram = macd_line - signal_line
-    return macd_line, signal_line, histogram
+    n = len(close)
+    macd_line = np.empty(n)
+    signal_line = np.empty(n)
+    histogram = np.empty(n)
+    _macd_loop(close.to_numpy(), fast, slow, signal, macd_line, signal_line, histogram)
+    return (pd.Series(macd_line, index=close.index),
+            pd.Series(signal_line, index=close.index),
+            pd.Series(histogram, index=close.index))
 
 def stochastic(high, low, close, k_period=14, d_period=3):
     """Calculate Stochastic Oscillator"""
-    lowest_low = low.rolling(window=k_period).min()
-    highest_high = high.rolling(window=k_period).max()
+    lowest_low = pd.Series(_roll_min(low.to_numpy(), k_period), index=low.index)
+    highest_high = pd.Series(_roll_max(high.to_numpy(), k_period), index=high.index)
 
     k_percent = 100 * ((close - lowest_low) / (highest_high - lowest_low))
     d_percent = k_percent.rolling(window=d_period).mean()
@@ -119,23 +223,214 @@ def volume_profile(close, volume, bins=20):
     price_min = close.min()
     price_max = close.max()
 
-    # Create price levels
+    # Create price levels and bucket volume into them in one pass
     price_levels = np.linspace(price_min, price_max, bins)
-    volume_at_price = []
-
-    for i in range(len(price_levels) - 1):
-        level_low = price_levels[i]
-        level_high = price_levels[i + 1]
+    level_volume, _ = np.histogram(close.to_numpy(), bins=price_levels,
+                                   weights=volume.to_numpy())
+
+    return pd.DataFrame({
+        'price': (price_levels[:-1] + price_levels[1:]) * 0.5,
+        'volume': level_volume
+    })
+
+@st.cache_resource(show_spinner=False)
+def _warm_kernels():
+    """Compile the jitted indicator kernels once per process for both price dtypes"""
+    for dtype in (np.float32, np.float64):
+        prices = pd.Series(np.linspace(100.0, 110.0, 32, dtype=dtype))
+        frame = pd.DataFrame({'High': prices + 1, 'Low': prices - 1, 'Close': prices})
+        supertrend(frame)
+        bollinger_bands(prices)
+        fisher_transform(frame['High'], frame['Low'])
+        macd(prices)
+    return True
 
-        mask = (close >= level_low) & (close < level_high)
-        level_volume = volume[mask].sum()
-
-        volume_at_price.append({
-            'price': (level_low + level_high) / 2,
-            'volume': level_volume
-        })
+# ──────────────────────────────────────────────────────────────
+# 📦 CACHED DATA FETCHES
+# ──────────────────────────────────────────────────────────────
 
-    return pd.DataFrame(volume_at_price)
+@st.cache_data(ttl=300, show_spinner=False)
+def _cached_download(sym, period):
+    """Daily OHLCV history for a single ticker"""
+    data = yf.download(sym, period=period, interval="1d",
+                       progress=False, multi_level_index=False)
+    # float32 prices halve the bytes each indicator pass streams; kernels accumulate in float64
+    for col in ('Open', 'High', 'Low', 'Close'):
+        if col in data:
+            data[col] = data[col].astype(np.float32)
+    return data
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _cached_indices_hist(indices):
+    """Last two sessions of several indices in one batched download"""
+    return yf.download(list(indices), period="2d", group_by='ticker',
+                       threads=True, progress=False)
+
+@st.cache_data(ttl=600, show_spinner=False)
+def _cached_news():
+    """Latest financial news articles"""
+    return get_financial_news()
+
+@st.cache_data(ttl=86400, show_spinner=False)
+def _company_name(sym, fallback):
+    """Company long name, looked up at most once a day per symbol"""
+    try:
+        return yf.Ticker(sym).info.get('longName', fallback)
+    except Exception:
+        return fallback
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _cached_nifty_data():
+    """NIFTY 50 history for the sidebar overview"""
+    return get_nifty_data()
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _cached_top_movers():
+    """Top gainers and losers"""
+    return get_top_gainers_losers()
+
+def _frame_key(df):
+    """Cheap cache key for an OHLCV frame"""
+    if df.empty:
+        return (0,)
+    # The full last bar plus close/volume sums tell apart frames that share
+    # dates and a last close, e.g. revised history or another symbol
+    last = df.iloc[-1]
+    return (df.index[0], df.index[-1], len(df),
+            float(last['Open']), float(last['High']), float(last['Low']),
+            float(last['Close']), float(last['Volume']),
+            float(df['Close'].sum()), float(df['Volume'].sum()))
+
+@st.cache_data(show_spinner=False, hash_funcs={pd.DataFrame: _frame_key})
+def _all_indicators(data):
+    """Add every chart indicator column to a downloaded OHLCV frame in one pass"""
+    data = data.copy()
+    data['SMA_20'] = data['Close'].rolling(20).mean()
+    data['SMA_50'] = data['Close'].rolling(50).mean()
+
+    bb_middle, bb_upper, bb_lower = bollinger_bands(data['Close'])
+    data['BB_Middle'] = bb_middle
+    data['BB_Upper'] = bb_upper
+    data['BB_Lower'] = bb_lower
+
+    data['RSI'] = rsi(data['Close'])
+
+    supertrend_line, supertrend_direction = supertrend(data)
+    data['Supertrend'] = supertrend_line
+    data['ST_Direction'] = supertrend_direction
+
+    fisher, fisher_signal = fisher_transform(data['High'], data['Low'])
+    data['Fisher'] = fisher
+    data['Fisher_Signal'] = fisher_signal
+
+    macd_line, macd_signal, macd_histogram = macd(data['Close'])
+    data['MACD'] = macd_line
+    data['MACD_Signal'] = macd_signal
+    data['MACD_Histogram'] = macd_histogram
+
+    stoch_k, stoch_d = stochastic(data['High'], data['Low'], data['Close'])
+    data['Stoch_K'] = stoch_k
+    data['Stoch_D'] = stoch_d
+    return data
+
+def _downsample(df, target=500):
+    """Stride-sample a frame down to roughly `target` rows for line overlays, keeping the last row"""
+    if len(df) <= target:
+        return df
+    step = len(df) // target
+    rows = np.arange(0, len(df), step)
+    # Always keep the latest bar so overlays reach the last candle
+    if rows[-1] != len(df) - 1:
+        rows = np.append(rows, len(df) - 1)
+    return df.iloc[rows]
+
+@st.cache_resource(ttl=300, show_spinner=False)
+def _build_main_fig(symbol, period, flags, data_key, _data):
+    """Candlestick figure with the selected overlays; callers must not mutate it"""
+    show_sma, show_bb, show_supertrend = flags
+    data = _data
+    fig_main = go.Figure()
+
+    # Candlestick chart
+    fig_main.add_trace(go.Candlestick(
+        x=data.index,
+        open=data['Open'],
+        high=data['High'],
+        low=data['Low'],
+        close=data['Close'],
+        name="Price",
+        increasing_line_color='#00d562',
+        decreasing_line_color='#f85149'
+    ))
+
+    # Add indicators based on user selection; overlays are thinned, candles stay native
+    overlay = _downsample(data)
+    if show_sma:
+        fig_main.add_trace(go.Scatter(
+            x=overlay.index, y=overlay['SMA_20'],
+            line=dict(color='#ff9500', width=1),
+            name='SMA 20'
+        ))
+        fig_main.add_trace(go.Scatter(
+            x=overlay.index, y=overlay['SMA_50'],
+            line=dict(color='#0969da', width=1),
+            name='SMA 50'
+        ))
+
+    if show_bb:
+        fig_main.add_trace(go.Scatter(
+            x=overlay.index, y=overlay['BB_Upper'],
+            line=dict(color='#8b949e', width=1),
+            name='BB Upper', opacity=0.7
+        ))
+        fig_main.add_trace(go.Scatter(
+            x=overlay.index, y=overlay['BB_Lower'],
+            line=dict(color='#8b949e', width=1),
+            name='BB Lower', opacity=0.7,
+            fill='tonexty', fillcolor='rgba(139, 148, 158, 0.1)'
+        ))
+
+    if show_supertrend:
+        # Color supertrend based on direction
+        fig_main.add_trace(go.Scatter(
+            x=overlay.index, y=overlay['Supertrend'],
+            line=dict(color='#EB4511', width=2),
+            name='Supertrend'
+        ))
+
+    fig_main.update_layout(
+        title=f"{symbol} - Price Chart with Indicators",
+        template="plotly_dark",
+        height=600,
+        xaxis_rangeslider_visible=False,
+        showlegend=True,
+        uirevision=symbol
+    )
+
+    return fig_main
+
+# Static sample breakout data for the Breakout Analysis tab
+_BREAKOUT_DF = pd.DataFrame({
+    'Symbol': ['RELIANCE', 'TCS', 'INFY', 'HDFC', 'ICICI'],
+    'Current Price': [2450, 3890, 1650, 1580, 950],
+    'Breakout Level': [2420, 3850, 1620, 1550, 930],
+    'Volume Spike': [2.3, 1.8, 2.1, 1.5, 2.0],
+    'Days in Range': [7, 6, 8, 7, 6]
+})
+
+@st.cache_resource(show_spinner=False)
+def _breakout_histogram():
+    """Histogram of the sample breakout stocks; callers must not mutate it"""
+    import plotly.express as px  # only needed for this chart
+    fig = px.histogram(
+        _BREAKOUT_DF,
+        x='Days in Range',
+        title="Distribution of Breakout Stocks by Days in Range",
+        nbins=5,
+        color_discrete_sequence=['#FF6B6B'])
+
+    fig.update_layout(height=400)
+    return fig
 
 # Configure page
 st.set_page_config(page_title="Dravyum",
@@ -143,6 +438,9 @@ st.set_page_config(page_title="Dravyum",
                    layout="wide",
                    initial_sidebar_state="expanded")
 
+# Compile indicator kernels up front instead of on the first chart load
+_warm_kernels()
+
 # Custom CSS for DRAVYUM - Sleek Black & White Theme
 
 # -- Theme selector & centralized theme variables --
@@ -169,9 +467,11 @@ _dark_vars = {
     "heading": "#EB4511"
 }
 
-_vars = _light_vars if theme_choice == "Light" else _dark_vars
-
-_theme_css = f"""
+@st.cache_data(show_spinner=False)
+def _build_css(theme):
+    """Theme stylesheet, formatted once per theme"""
+    _vars = _light_vars if theme == "Light" else _dark_vars
+    return f"""
 <style>
 :root {{
     --bg: {_vars['bg']};
@@ -207,10 +507,9 @@ a, .link, .stButton button {{
 
 </style>
 """
-st.markdown(_theme_css, unsafe_allow_html=True)
+
+st.markdown(_build_css(theme_choice), unsafe_allow_html=True)
 # -- End theme injection --
-,
-            unsafe_allow_html=True)
 
 def main():
     # Luxury header with brand name
@@ -228,7 +527,7 @@ def main():
         st.header("Quick Market Overview")
         try:
             # Get NIFTY 50 data
-            nifty_data = get_nifty_data()
+            nifty_data = _cached_nifty_data()
             if not nifty_data.empty:
                 current_price = nifty_data['Close'].iloc[-1]
                 prev_price = nifty_data['Close'].iloc[-2]
@@ -273,19 +572,18 @@ def main():
         # Load news
         if 'latest_news' not in st.session_state:
             with st.spinner("Loading news..."):
-                st.session_state.latest_news = get_financial_news()
+                st.session_state.latest_news = _cached_news()
 
         news_articles = st.session_state.latest_news[:5]  # Show top 5 in sidebar
 
-        for article in news_articles:
-            st.markdown(f"""
-            <div style='padding: 0.5rem; margin: 0.3rem 0; background: linear-gradient(145deg, #C6AC8E, #EAEOD5); 
-                 border-radius: 8px; border-left: 3px solid #000000;'>
-                <p style='margin: 0; font-size: 0.8rem; font-weight: bold; color: #000000;'>{article['title'][:60]}...</p>
-                <p style='margin: 0; font-size: 0.7rem; opacity: 0.7; color: #000000;'>{article['source']} • {article['timestamp']}</p>
-            </div>
-            """,
-                        unsafe_allow_html=True)
+        sidebar_news = "".join(
+            f"<div style='padding: 0.5rem; margin: 0.3rem 0; background: linear-gradient(145deg, #C6AC8E, #EAEOD5); "
+            f"border-radius: 8px; border-left: 3px solid #000000;'>"
+            f"<p style='margin: 0; font-size: 0.8rem; font-weight: bold; color: #000000;'>{article['title'][:60]}...</p>"
+            f"<p style='margin: 0; font-size: 0.7rem; opacity: 0.7; color: #000000;'>{article['source']} • {article['timestamp']}</p>"
+            f"</div>"
+            for article in news_articles)
+        st.markdown(sidebar_news, unsafe_allow_html=True)
 
         # Quick actions
         st.markdown("---")
@@ -294,8 +592,9 @@ def main():
         col_news, col_data = st.columns(2)
         with col_news:
             if st.button("📰 Refresh News", use_container_width=True):
+                _cached_news.clear()
                 with st.spinner("Loading news..."):
-                    st.session_state.latest_news = get_financial_news()
+                    st.session_state.latest_news = _cached_news()
                     st.rerun()
 
         with col_data:
@@ -319,25 +618,26 @@ def main():
         try:
             if 'latest_news' not in st.session_state:
                 with st.spinner("Loading latest market news..."):
-                    st.session_state.latest_news = get_financial_news()
+                    st.session_state.latest_news = _cached_news()
 
             news_articles = st.session_state.latest_news[:8]  # Show top 8 in main area
 
-            # Display news in 2 columns
-            news_col1, news_col2 = st.columns(2)
-            for i, article in enumerate(news_articles):
-                with news_col1 if i % 2 == 0 else news_col2:
-                    st.markdown(f"""
-                    <div style='padding: 2rem; margin: 2rem 0; background: linear-gradient(145deg, #C6AC8E, #EAEOD5); 
-                         border-radius: 10px; border: 2px solid #000000; box-shadow: 0 4px 8px rgba(0,0,0,0.1);'>
-                        <h4 style='margin: 0; font-size: 1rem; font-weight: bold; color: #000000; line-height: 1.2;'>{article['title']}</h4>
-                        <p style='margin: 0.3rem 0 0 0; font-size: 0.75rem; opacity: 0.8; color: #000000;'>
-                            📺 {article['source']} • ⏰ {article['timestamp']}
-                        </p>
-                        {f"<p style='margin: 0.3rem 0 0 0; font-size: 0.7rem;'><a href='{article['url']}' target='_blank' style='color: #000000; text-decoration: none;'>🔗 Read Full Article</a></p>" if article['url'] != '#' else ''}
-                    </div>
-                    """,
-                                unsafe_allow_html=True)
+            # Display news in a 2-column grid with a single markdown call
+            news_cards = []
+            for article in news_articles:
+                link = (f"<p style='margin: 0.3rem 0 0 0; font-size: 0.7rem;'><a href='{article['url']}' target='_blank' "
+                        f"style='color: #000000; text-decoration: none;'>🔗 Read Full Article</a></p>"
+                        if article['url'] != '#' else '')
+                news_cards.append(
+                    f"<div style='padding: 2rem; background: linear-gradient(145deg, #C6AC8E, #EAEOD5); "
+                    f"border-radius: 10px; border: 2px solid #000000; box-shadow: 0 4px 8px rgba(0,0,0,0.1);'>"
+                    f"<h4 style='margin: 0; font-size: 1rem; font-weight: bold; color: #000000; line-height: 1.2;'>{article['title']}</h4>"
+                    f"<p style='margin: 0.3rem 0 0 0; font-size: 0.75rem; opacity: 0.8; color: #000000;'>"
+                    f"📺 {article['source']} • ⏰ {article['timestamp']}</p>"
+                    f"{link}</div>")
+            st.markdown("<div class='news-grid' style='display: grid; grid-template-columns: 1fr 1fr; gap: 2rem; margin: 2rem 0;'>"
+                        + "".join(news_cards) + "</div>",
+                        unsafe_allow_html=True)
         except Exception as e:
             st.error(f"Error loading news: {str(e)}")
             st.info("News service temporarily unavailable")
@@ -352,23 +652,26 @@ def main():
         indices = ["^NSEI", "^BSESN", "^NSEBANK"]
         index_names = ["NIFTY 50", "SENSEX", "BANK NIFTY"]
 
-        for i, (index, name) in enumerate(zip(indices, index_names)):
-            try:
-                ticker = yf.Ticker(index)
-                hist = ticker.history(period="2d")
-                if not hist.empty:
-                    current = hist['Close'].iloc[-1]
-                    prev = hist['Close'].iloc[-2]
-                    change = current - prev
-                    change_pct = (change / prev) * 100
-
-                    with [col1, col2, col3][i]:
-                        st.metric(label=name,
-                                  value=f"₹{current:,.2f}",
-                                  delta=f"{change:+.2f} ({change_pct:+.2f}%)")
-            except Exception as e:
-                with [col1, col2, col3][i]:
-                    st.error(f"Error loading {name}")
+        index_cols = [col1, col2, col3]
+        try:
+            closes = _cached_indices_hist(tuple(indices)).xs('Close', axis=1, level=1)
+            closes = closes.reindex(columns=indices).ffill()
+            metrics = pd.DataFrame({'name': index_names,
+                                    'cur': closes.iloc[-1].to_numpy(),
+                                    'prev': closes.iloc[-2].to_numpy()})
+            metrics['change'] = metrics['cur'] - metrics['prev']
+            metrics['change_pct'] = (metrics['change'] / metrics['prev']) * 100
+
+            for col, row in zip(index_cols, metrics.itertuples()):
+                if pd.isna(row.change):
+                    col.error(f"Error loading {row.name}")
+                else:
+                    col.metric(label=row.name,
+                               value=f"₹{row.cur:,.2f}",
+                               delta=f"{row.change:+.2f} ({row.change_pct:+.2f}%)")
+        except Exception as e:
+            for col, name in zip(index_cols, index_names):
+                col.error(f"Error loading {name}")
 
         # Market sentiment gauge
         with col4:
@@ -384,7 +687,7 @@ def main():
     with tab2:
         st.header("Top Gainers & Losers")
         try:
-            gainers, losers = get_top_gainers_losers()
+            gainers, losers = _cached_top_movers()
 
             col1, col2 = st.columns(2)
             with col1:
@@ -416,26 +719,10 @@ def main():
         st.markdown("Stocks breaking out above 6-8 day trading range")
         try:
             # Sample breakout analysis - in production this would analyze all NIFTY stocks
-            breakout_data = {
-                'Symbol': ['RELIANCE', 'TCS', 'INFY', 'HDFC', 'ICICI'],
-                'Current Price': [2450, 3890, 1650, 1580, 950],
-                'Breakout Level': [2420, 3850, 1620, 1550, 930],
-                'Volume Spike': [2.3, 1.8, 2.1, 1.5, 2.0],
-                'Days in Range': [7, 6, 8, 7, 6]
-            }
-
-            df_breakout = pd.DataFrame(breakout_data)
+            df_breakout = _BREAKOUT_DF
 
             # Histogram of breakout stocks
-            fig = px.histogram(
-                df_breakout,
-                x='Days in Range',
-                title="Distribution of Breakout Stocks by Days in Range",
-                nbins=5,
-                color_discrete_sequence=['#FF6B6B'])
-
-            fig.update_layout(height=400)
-            st.plotly_chart(fig, use_container_width=True)
+            st.plotly_chart(_breakout_histogram(), use_container_width=True)
 
             # Breakout stocks table
             st.subheader("Current Breakout Stocks")
@@ -491,42 +778,16 @@ def main():
                 with st.spinner(f"Loading chart data for {symbol}..."):
                     # Fetch data
                     ticker_symbol = f"{symbol}.NS"
-                    data = yf.download(ticker_symbol, period=period, interval="1d")
+                    data = _cached_download(ticker_symbol, period)
 
                     if data.empty:
                         st.error(f"❌ No data found for {symbol}. Please check the symbol.")
                     else:
-                        # Calculate all indicators
-                        data['SMA_20'] = data['Close'].rolling(20).mean()
-                        data['SMA_50'] = data['Close'].rolling(50).mean()
-
-                        bb_middle, bb_upper, bb_lower = bollinger_bands(data['Close'])
-                        data['BB_Middle'] = bb_middle
-                        data['BB_Upper'] = bb_upper
-                        data['BB_Lower'] = bb_lower
-
-                        data['RSI'] = rsi(data['Close'])
-
-                        supertrend_line, supertrend_direction = supertrend(data)
-                        data['Supertrend'] = supertrend_line
-                        data['ST_Direction'] = supertrend_direction
-
-                        fisher, fisher_signal = fisher_transform(data['High'], data['Low'])
-                        data['Fisher'] = fisher
-                        data['Fisher_Signal'] = fisher_signal
-
-                        macd_line, macd_signal, macd_histogram = macd(data['Close'])
-                        data['MACD'] = macd_line
-                        data['MACD_Signal'] = macd_signal
-                        data['MACD_Histogram'] = macd_histogram
-
-                        stoch_k, stoch_d = stochastic(data['High'], data['Low'], data['Close'])
-                        data['Stoch_K'] = stoch_k
-                        data['Stoch_D'] = stoch_d
+                        # Indicators are computed once per frame; checkboxes only toggle rendering
+                        data = _all_indicators(data)
 
                         # Get company info
-                        info = yf.Ticker(ticker_symbol).info
-                        company_name = info.get('longName', symbol)
+                        company_name = _company_name(ticker_symbol, symbol)
 
                         # Stock info header
                         current_price = data['Close'].iloc[-1]
@@ -543,63 +804,10 @@ def main():
                         </div>
                         """, unsafe_allow_html=True)
 
-                        # Main price chart
-                        fig_main = go.Figure()
-
-                        # Candlestick chart
-                        fig_main.add_trace(go.Candlestick(
-                            x=data.index,
-                            open=data['Open'],
-                            high=data['High'],
-                            low=data['Low'],
-                            close=data['Close'],
-                            name="Price",
-                            increasing_line_color='#00d562',
-                            decreasing_line_color='#f85149'
-                        ))
-
-                        # Add indicators based on user selection
-                        if show_sma:
-                            fig_main.add_trace(go.Scatter(
-                                x=data.index, y=data['SMA_20'],
-                                line=dict(color='#ff9500', width=1),
-                                name='SMA 20'
-                            ))
-                            fig_main.add_trace(go.Scatter(
-                                x=data.index, y=data['SMA_50'],
-                                line=dict(color='#0969da', width=1),
-                                name='SMA 50'
-                            ))
-
-                        if show_bb:
-                            fig_main.add_trace(go.Scatter(
-                                x=data.index, y=data['BB_Upper'],
-                                line=dict(color='#8b949e', width=1),
-                                name='BB Upper', opacity=0.7
-                            ))
-                            fig_main.add_trace(go.Scatter(
-                                x=data.index, y=data['BB_Lower'],
-                                line=dict(color='#8b949e', width=1),
-                                name='BB Lower', opacity=0.7,
-                                fill='tonexty', fillcolor='rgba(139, 148, 158, 0.1)'
-                            ))
-
-                        if show_supertrend:
-                            # Color supertrend based on direction
-                            fig_main.add_trace(go.Scatter(
-                                x=data.index, y=data['Supertrend'],
-                                line=dict(color='#EB4511', width=2),
-                                name='Supertrend'
-                            ))
-
-                        fig_main.update_layout(
-                            title=f"{symbol} - Price Chart with Indicators",
-                            template="plotly_dark",
-                            height=600,
-                            xaxis_rangeslider_visible=False,
-                            showlegend=True
-                        )
-
+                        # Main price chart (rebuilt only when the data or overlay flags change)
+                        fig_main = _build_main_fig(symbol, period,
+                                                   (show_sma, show_bb, show_supertrend),
+                                                   _frame_key(data), data)
                         st.plotly_chart(fig_main, use_container_width=True)
 
                         # Sub-charts for oscillators
@@ -749,22 +957,26 @@ def main():
 
                         col1, col2, col3, col4 = st.columns(4)
 
+                        # Read the latest bar and volume array once
+                        last = data.iloc[-1]
+                        volume_values = data['Volume'].to_numpy()
+
                         with col1:
-                            current_rsi = data['RSI'].iloc[-1]
+                            current_rsi = last['RSI']
                             rsi_signal = "Overbought" if current_rsi > 70 else "Oversold" if current_rsi < 30 else "Neutral"
                             rsi_color = "#f85149" if current_rsi > 70 else "#00d562" if current_rsi < 30 else "#8b949e"
 
                             st.metric("RSI Signal", rsi_signal, f"{current_rsi:.1f}")
 
                         with col2:
-                            st_direction = data['ST_Direction'].iloc[-1]
+                            st_direction = last['ST_Direction']
                             st_signal = "🟢 Bullish" if st_direction > 0 else "🔴 Bearish"
                             st.metric("Supertrend", st_signal)
 
                         with col3:
                             # MACD signal
                             if 'MACD' in data.columns and 'MACD_Signal' in data.columns:
-                                macd_diff = data['MACD'].iloc[-1] - data['MACD_Signal'].iloc[-1]
+                                macd_diff = last['MACD'] - last['MACD_Signal']
                                 macd_signal = "🟢 Bullish" if macd_diff > 0 else "🔴 Bearish"
                                 st.metric("MACD Signal", macd_signal)
                             else:
@@ -772,8 +984,8 @@ def main():
 
                         with col4:
                             # Volume trend
-                            recent_volume = data['Volume'].iloc[-5:].mean()
-                            avg_volume = data['Volume'].mean()
+                            recent_volume = volume_values[-5:].mean()
+                            avg_volume = volume_values.mean()
                             volume_trend = "🔥 High" if recent_volume > avg_volume * 1.5 else "📉 Low" if recent_volume < avg_volume * 0.5 else "➡️ Normal"
                             st.metric("Volume Trend", volume_trend)
 
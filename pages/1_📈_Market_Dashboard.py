@@ -1,18 +1,19 @@
 import streamlit as st
 import pandas as pd
 import plotly.graph_objects as go
-import plotly.express as px
 from datetime import datetime, timedelta
 import yfinance as yf
 import numpy as np
 import sys
 import os
+import time
+import logging
 
 # Add the parent directory to the path to import utils
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from utils.market_data import (get_nifty_data, get_top_gainers_losers,
-                               get_market_status, get_real_time_price,
+                               get_market_status,
                                calculate_technical_indicators,
                                detect_breakouts)
 from utils.fundamentals import get_fundamental_data
@@ -20,13 +21,27 @@ from utils.fundamentals import get_fundamental_data
 st.set_page_config(page_title="Market Dashboard - TRADESENSEI", page_icon="🥋", layout="wide")
 
 
+def _decimate_ohlcv(data, max_points=2000):
+    """Merge consecutive bars into at most max_points OHLCV buckets"""
+    if len(data) <= max_points:
+        return data
+    bucket_size = -(-len(data) // max_points)
+    buckets = np.arange(len(data)) // bucket_size
+    agg = {'Open': 'first', 'High': 'max', 'Low': 'min', 'Close': 'last', 'Volume': 'sum'}
+    agg = {col: how for col, how in agg.items() if col in data.columns}
+    decimated = data.groupby(buckets).agg(agg)
+    decimated.index = data.index[::bucket_size]
+    return decimated
+
+
 def create_candlestick_chart(data, title):
     """Create a candlestick chart"""
+    data = _decimate_ohlcv(data)
     fig = go.Figure(data=go.Candlestick(x=data.index,
-                                        open=data['Open'],
-                                        high=data['High'],
-                                        low=data['Low'],
-                                        close=data['Close'],
+                                        open=data['Open'].to_numpy(),
+                                        high=data['High'].to_numpy(),
+                                        low=data['Low'].to_numpy(),
+                                        close=data['Close'].to_numpy(),
                                         name=title))
 
     fig.update_layout(title=title,
@@ -40,13 +55,17 @@ def create_candlestick_chart(data, title):
 
 def create_volume_chart(data):
     """Create volume chart"""
+    data = _decimate_ohlcv(data)
     fig = go.Figure()
 
     fig.add_trace(
-        go.Bar(x=data.index,
-               y=data['Volume'],
-               name='Volume',
-               marker_color='rgba(255, 107, 107, 0.7)'))
+        go.Scattergl(x=data.index,
+                     y=data['Volume'].to_numpy(),
+                     name='Volume',
+                     mode='lines',
+                     fill='tozeroy',
+                     fillcolor='rgba(255, 107, 107, 0.7)',
+                     line=dict(color='rgba(255, 107, 107, 0.7)', width=0)))
 
     fig.update_layout(title="Trading Volume",
                       xaxis_title="Date",
@@ -56,6 +75,111 @@ def create_volume_chart(data):
     return fig
 
 
+# Arrow-native number formatting for the movers tables (sign shown by the emoji column)
+MOVERS_COLUMN_CONFIG = {
+    'LTP': st.column_config.NumberColumn('LTP', format='₹%.2f'),
+    'Change': st.column_config.NumberColumn('Δ', format='%+.2f'),
+    '% Change': st.column_config.NumberColumn('Δ%', format='%+.2f%%')
+}
+
+
+@st.cache_data(show_spinner=False)
+def _hist_bars(ranges, bins=20):
+    """Histogram bin centers, widths and counts for breakout ranges"""
+    counts, edges = np.histogram(np.asarray(ranges), bins=bins)
+    return (edges[:-1] + edges[1:]) / 2, np.diff(edges), counts
+
+
+def create_breakout_histogram(ranges, bins, color, title):
+    """Create breakout range histogram with a mean marker"""
+    centers, widths, counts = _hist_bars(tuple(ranges), bins)
+    mean_range = float(np.mean(ranges))
+
+    fig = go.Figure(go.Bar(x=centers,
+                           y=counts,
+                           width=widths,
+                           marker_color=color,
+                           marker_line_color='black',
+                           marker_line_width=1,
+                           opacity=0.7))
+    fig.add_vline(x=mean_range,
+                  line_dash='dash',
+                  line_color='red',
+                  line_width=2,
+                  annotation_text=f'Mean: {mean_range:.1f} days')
+    fig.update_layout(title=title,
+                      xaxis_title="Breakout Range (Days)",
+                      yaxis_title="Number of Stocks",
+                      height=400,
+                      showlegend=False)
+
+    return fig
+
+
+def _available_symbols(batch):
+    """Symbols with at least one close in a batched download"""
+    if batch.empty:
+        return set()
+    closes = batch.xs('Close', level=1, axis=1)
+    return set(closes.dropna(axis=1, how='all').columns)
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _batch_history(symbols):
+    """Last two sessions for several symbols in one batched download"""
+    batch = yf.download(list(symbols), period="2d", group_by="ticker",
+                        threads=True, progress=False, auto_adjust=False)
+    # Logged once per fetch rather than on every rerun
+    missing = sorted(set(symbols) - _available_symbols(batch))
+    if missing:
+        logging.warning("Missing data: %s", missing)
+    return batch
+
+
+@st.cache_data(ttl=30, show_spinner=False)
+def _market_status():
+    """Market open/close status"""
+    return get_market_status()
+
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _nifty_data(period):
+    """NIFTY 50 history"""
+    return get_nifty_data(period=period)
+
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _top_movers():
+    """Top gainers and losers"""
+    return get_top_gainers_losers()
+
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _breakouts():
+    """NIFTY breakout scan"""
+    return detect_breakouts()
+
+
+@st.cache_data(ttl=12 * 3600, show_spinner=False)
+def _fundamentals(symbol):
+    """Fundamental data for a stock"""
+    return get_fundamental_data(symbol)
+
+
+@st.cache_data(ttl=30, show_spinner=False)
+def _quote(symbol):
+    """Last five daily bars for an NSE stock"""
+    return yf.download(f"{symbol}.NS", period="5d", progress=False,
+                       auto_adjust=False, multi_level_index=False)
+
+
+@st.fragment(run_every="30s")
+def _auto_refresh(started_at):
+    """Schedule a full page rerun once the page is 30 seconds old"""
+    if time.time() - started_at >= 30:
+        st.rerun()
+
+
 # Add luxury styling
 st.markdown("""
 <style>
@@ -108,66 +232,9 @@ st.markdown("""
             unsafe_allow_html=True)
 
 
-def main():
-    # DRAVYUM header for Market Dashboard
-    st.markdown("""
-    <div class="main-header">
-        <h1 style="margin: 0; font-size: 2.5rem;">Market Dashboard</h1>
-        <p style="margin: 0.3rem 0 0 0; opacity: 0.9;">Real-time market intelligence and analysis</p>
-    </div>
-    """,
-                unsafe_allow_html=True)
-
-    # Market status indicator
-    market_status = get_market_status()
-
-    col1, col2, col3 = st.columns([1, 1, 2])
-
-    with col1:
-        if market_status.get('is_open', False):
-            st.success("🟢 Market OPEN")
-        else:
-            st.error("🔴 Market CLOSED")
-
-    with col2:
-        st.info(f"🕒 {market_status.get('current_time', 'N/A')}")
-
-    with col3:
-        st.info(f"📅 Next Session: {market_status.get('next_open', 'N/A')}")
-
-    # Main indices overview
-    st.header("📊 Major Indices")
-
-    indices = {
-        "NIFTY 50": "^NSEI",
-        "SENSEX": "^BSESN",
-        "BANK NIFTY": "^NSEBANK",
-        "NIFTY IT": "^CNXIT"
-    }
-
-    index_cols = st.columns(len(indices))
-
-    for i, (name, symbol) in enumerate(indices.items()):
-        with index_cols[i]:
-            try:
-                ticker = yf.Ticker(symbol)
-                hist = ticker.history(period="2d")
-
-                if not hist.empty and len(hist) >= 2:
-                    current = hist['Close'].iloc[-1]
-                    previous = hist['Close'].iloc[-2]
-                    change = current - previous
-                    change_pct = (change / previous) * 100
-
-                    st.metric(label=name,
-                              value=f"₹{current:,.2f}",
-                              delta=f"{change:+.2f} ({change_pct:+.2f}%)")
-                else:
-                    st.metric(label=name, value="Data unavailable")
-
-            except Exception as e:
-                st.metric(label=name, value="Error loading data")
-
+@st.fragment
+def _ai_summary_section():
+    """AI market summary, rerun independently of the rest of the page"""
     # AI Market Summary Section
     st.header("🤖 AI Market Summary")
 
@@ -202,151 +269,31 @@ def main():
     except Exception as e:
         st.error(f"Error generating AI market summary: {str(e)}")
 
-    # Detailed NIFTY analysis
-    st.header("🎯 NIFTY 50 Detailed Analysis")
-
-    try:
-        nifty_data = get_nifty_data(period="3mo")
-
-        if not nifty_data.empty:
-            # Add technical indicators
-            nifty_with_indicators = calculate_technical_indicators(nifty_data)
-
-            col1, col2 = st.columns([2, 1])
-
-            with col1:
-                # Candlestick chart
-                candlestick_fig = create_candlestick_chart(
-                    nifty_data.tail(60), "NIFTY 50 - Last 60 Days")
-
-                # Add moving averages
-                if 'SMA_20' in nifty_with_indicators.columns:
-                    candlestick_fig.add_trace(
-                        go.Scatter(x=nifty_with_indicators.index.tail(60),
-                                   y=nifty_with_indicators['SMA_20'].tail(60),
-                                   mode='lines',
-                                   name='SMA 20',
-                                   line=dict(color='orange', width=1)))
-
-                if 'SMA_50' in nifty_with_indicators.columns:
-                    candlestick_fig.add_trace(
-                        go.Scatter(x=nifty_with_indicators.index.tail(60),
-                                   y=nifty_with_indicators['SMA_50'].tail(60),
-                                   mode='lines',
-                                   name='SMA 50',
-                                   line=dict(color='blue', width=1)))
-
-                candlestick_fig.update_layout(showlegend=True)
-                st.plotly_chart(candlestick_fig, use_container_width=True)
-
-            with col2:
-                # Key technical levels
-                current_price = nifty_data['Close'].iloc[-1]
-                high_52w = nifty_data['High'].max()
-                low_52w = nifty_data['Low'].min()
-
-                st.subheader("📈 Technical Levels")
-                st.metric("52W High", f"₹{high_52w:,.2f}")
-                st.metric("52W Low", f"₹{low_52w:,.2f}")
-
-                if 'RSI' in nifty_with_indicators.columns:
-                    rsi = nifty_with_indicators['RSI'].iloc[-1]
-                    st.metric("RSI (14)", f"{rsi:.1f}")
-
-                # Support/Resistance levels
-                st.subheader("🎯 Key Levels")
-                recent_data = nifty_data.tail(20)
-                support = recent_data['Low'].min()
-                resistance = recent_data['High'].max()
-
-                st.metric("Support", f"₹{support:,.2f}")
-                st.metric("Resistance", f"₹{resistance:,.2f}")
-
-            # Volume analysis
-            volume_fig = create_volume_chart(nifty_data.tail(60))
-            st.plotly_chart(volume_fig, use_container_width=True)
-
-        else:
-            st.error("Unable to fetch NIFTY data")
-
-    except Exception as e:
-        st.error(f"Error in NIFTY analysis: {str(e)}")
-
-    # Top movers section
-    st.header("🔥 Market Movers")
-
-    try:
-        gainers, losers = get_top_gainers_losers()
-
-        col1, col2 = st.columns(2)
-
-        with col1:
-            st.subheader("🟢 Top Gainers")
-            if not gainers.empty:
-                # Color code the dataframe
-                def color_positive(val):
-                    return 'color: green' if val > 0 else ''
-
-                styled_gainers = gainers.head(10).style.applymap(
-                    color_positive, subset=['Change', '% Change'])
-                st.dataframe(styled_gainers, use_container_width=True)
-            else:
-                st.info("No gainers data available")
-
-        with col2:
-            st.subheader("🔴 Top Losers")
-            if not losers.empty:
-
-                def color_negative(val):
-                    return 'color: red' if val < 0 else ''
-
-                styled_losers = losers.head(10).style.applymap(
-                    color_negative, subset=['Change', '% Change'])
-                st.dataframe(styled_losers, use_container_width=True)
-            else:
-                st.info("No losers data available")
-
-    except Exception as e:
-        st.error(f"Error loading top movers: {str(e)}")
 
+@st.fragment
+def _sector_section(batch, sector_data):
+    """Sector performance chart and table from the batched index download"""
     # Sectoral performance
     st.header("🏭 Sector Performance")
 
     try:
-        # Sample sector indices (in production, this would fetch real sector data)
-        sector_data = {
-            'Bank Nifty': '^NSEBANK',
-            'IT': '^CNXIT',
-            'Auto': '^CNXAUTO',
-            'Pharma': '^CNXPHARMA',
-            'FMCG': '^CNXFMCG'
-        }
-
-        sector_performance = []
-
-        for sector, symbol in sector_data.items():
-            try:
-                ticker = yf.Ticker(symbol)
-                hist = ticker.history(period="2d")
-
-                if not hist.empty and len(hist) >= 2:
-                    current = hist['Close'].iloc[-1]
-                    previous = hist['Close'].iloc[-2]
-                    change_pct = ((current - previous) / previous) * 100
-
-                    sector_performance.append({
-                        'Sector': sector,
-                        'Change %': change_pct,
-                        'Current': current
-                    })
-            except:
-                continue
-
-        if sector_performance:
-            sector_df = pd.DataFrame(sector_performance)
-            sector_df = sector_df.sort_values('Change %', ascending=False)
-
-            # Create sector performance chart
+        # Last two closes for every sector in one frame; missing symbols drop out as NaN
+        sector_names = {symbol: sector for sector, symbol in sector_data.items()}
+        if batch.empty:
+            sector_df = pd.DataFrame()
+        else:
+            closes = (batch.xs('Close', level=1, axis=1)
+                      .reindex(columns=list(sector_names)).ffill().iloc[-2:])
+            change_pct = closes.pct_change().iloc[-1] * 100
+            sector_df = pd.DataFrame({
+                'Sector': [sector_names[symbol] for symbol in closes.columns],
+                'Change %': change_pct.to_numpy(),
+                'Current': closes.iloc[-1].to_numpy()
+            }).dropna().sort_values('Change %', ascending=False)
+
+        if not sector_df.empty:
+            # Create sector performance chart (plotly.express is only needed here)
+            import plotly.express as px
             fig = px.bar(sector_df,
                          x='Sector',
                          y='Change %',
@@ -364,16 +311,16 @@ def main():
     except Exception as e:
         st.error(f"Error loading sector performance: {str(e)}")
 
+
+@st.fragment
+def _breakout_section():
+    """Breakout histogram, statistics and table"""
     # Breakout stocks
     st.header("🚀 Breakout Analysis")
 
     try:
-        import matplotlib.pyplot as plt
-        import matplotlib
-        matplotlib.use('Agg')  # Use non-interactive backend
-
         # Get NIFTY stocks breakout data
-        breakout_result = detect_breakouts()  # Now works without parameters
+        breakout_result = _breakouts()
         breakout_data = breakout_result.get('breakouts', []) if isinstance(
             breakout_result, dict) else []
 
@@ -381,9 +328,6 @@ def main():
             col1, col2 = st.columns([2, 1])
 
             with col1:
-                # Create histogram of breakout ranges using matplotlib
-                fig, ax = plt.subplots(figsize=(10, 6))
-
                 # Extract breakout range data
                 breakout_ranges = []
                 for stock in breakout_data:
@@ -391,33 +335,10 @@ def main():
                         breakout_ranges.append(stock['breakout_range'])
 
                 if breakout_ranges:
-                    # Create histogram
-                    ax.hist(breakout_ranges,
-                            bins=20,
-                            alpha=0.7,
-                            color='#FF6B6B',
-                            edgecolor='black')
-                    ax.set_xlabel('Breakout Range (Days)', fontsize=12)
-                    ax.set_ylabel('Number of Stocks', fontsize=12)
-                    ax.set_title(
-                        'NIFTY Stocks Breakout Distribution (6-8 Day Range)',
-                        fontsize=14,
-                        fontweight='bold')
-                    ax.grid(True, alpha=0.3)
-
-                    # Add statistics text
-                    mean_range = np.mean(breakout_ranges)
-                    ax.axvline(mean_range,
-                               color='red',
-                               linestyle='--',
-                               linewidth=2,
-                               label=f'Mean: {mean_range:.1f} days')
-                    ax.legend()
-
-                    # Style the plot
-                    plt.tight_layout()
-                    st.pyplot(fig)
-                    plt.close()  # Close figure to free memory
+                    st.plotly_chart(create_breakout_histogram(
+                        breakout_ranges, 20, '#FF6B6B',
+                        'NIFTY Stocks Breakout Distribution (6-8 Day Range)'),
+                                    use_container_width=True)
                 else:
                     st.info("No breakout range data available for histogram")
 
@@ -471,49 +392,16 @@ def main():
                 st.info("No breakout data available at the moment")
 
         else:
-            st.info(
-                "🔍 No current breakouts detected. Breakout analysis will update during market hours."
-            )
-
-            # Show a sample histogram for demonstration
-            st.subheader("📊 Sample NIFTY Breakout Distribution")
-
-            # Create sample data for demonstration
-            np.random.seed(42)
-            sample_ranges = np.random.normal(7, 2, 100)  # Mean 7 days, std 2
-            sample_ranges = np.clip(sample_ranges, 3,
-                                    15)  # Clip to reasonable range
-
-            fig, ax = plt.subplots(figsize=(10, 6))
-            ax.hist(sample_ranges,
-                    bins=15,
-                    alpha=0.7,
-                    color='#4ECDC4',
-                    edgecolor='black')
-            ax.set_xlabel('Breakout Range (Days)', fontsize=12)
-            ax.set_ylabel('Number of Stocks', fontsize=12)
-            ax.set_title('Sample NIFTY Stocks Breakout Distribution',
-                         fontsize=14,
-                         fontweight='bold')
-            ax.grid(True, alpha=0.3)
-            ax.axvline(np.mean(sample_ranges),
-                       color='red',
-                       linestyle='--',
-                       linewidth=2,
-                       label=f'Mean: {np.mean(sample_ranges):.1f} days')
-            ax.legend()
-            plt.tight_layout()
-            st.pyplot(fig)
-            plt.close()
-
-            st.info(
-                "This is a sample histogram. Live data will appear when market breakouts are detected."
-            )
+            st.info("🔍 Breakout analysis runs during market hours.")
 
     except Exception as e:
         st.error(f"Error in breakout analysis: {str(e)}")
         st.info("Breakout analysis temporarily unavailable")
 
+
+@st.fragment
+def _lookup_section():
+    """Quick stock lookup; a Get Quote click reruns only this section"""
     # Quick stock lookup
     st.header("🔍 Quick Stock Lookup")
 
@@ -528,61 +416,56 @@ def main():
                 with col2:
                     with st.spinner(f"Fetching data for {symbol_input}..."):
                         try:
-                            # Get real-time price
-                            current_price = get_real_time_price(symbol_input)
+                            # One download gives both the latest and previous close
+                            stock_data = _quote(symbol_input)
+                            current_price = stock_data['Close'].iloc[
+                                -1] if not stock_data.empty else None
 
                             if current_price:
-                                # Get additional data
-                                stock_data = yf.Ticker(
-                                    f"{symbol_input}.NS").history(period="5d")
-
-                                if not stock_data.empty:
-                                    prev_price = stock_data['Close'].iloc[
-                                        -2] if len(
-                                            stock_data) > 1 else current_price
-                                    change = current_price - prev_price
-                                    change_pct = (change / prev_price) * 100
-
-                                    st.metric(
-                                        label=symbol_input,
-                                        value=f"₹{current_price:.2f}",
-                                        delta=
-                                        f"{change:+.2f} ({change_pct:+.2f}%)")
-
-                                    # Get fundamental data
-                                    fundamental = get_fundamental_data(
-                                        symbol_input)
-                                    if fundamental:
-                                        basic_info = fundamental.get(
-                                            'basic_info', {})
-                                        valuation = fundamental.get(
-                                            'valuation_ratios', {})
-
-                                        info_col1, info_col2 = st.columns(2)
-
-                                        with info_col1:
+                                prev_price = stock_data['Close'].iloc[
+                                    -2] if len(
+                                        stock_data) > 1 else current_price
+                                change = current_price - prev_price
+                                change_pct = (change / prev_price) * 100
+
+                                st.metric(
+                                    label=symbol_input,
+                                    value=f"₹{current_price:.2f}",
+                                    delta=
+                                    f"{change:+.2f} ({change_pct:+.2f}%)")
+
+                                # Get fundamental data
+                                fundamental = _fundamentals(
+                                    symbol_input)
+                                if fundamental:
+                                    basic_info = fundamental.get(
+                                        'basic_info', {})
+                                    valuation = fundamental.get(
+                                        'valuation_ratios', {})
+
+                                    info_col1, info_col2 = st.columns(2)
+
+                                    with info_col1:
+                                        st.write(
+                                            f"**Company:** {basic_info.get('company_name', 'N/A')}"
+                                        )
+                                        st.write(
+                                            f"**Sector:** {basic_info.get('sector', 'N/A')}"
+                                        )
+
+                                    with info_col2:
+                                        pe_ratio = valuation.get(
+                                            'pe_ratio')
+                                        if pe_ratio:
                                             st.write(
-                                                f"**Company:** {basic_info.get('company_name', 'N/A')}"
+                                                f"**P/E Ratio:** {pe_ratio:.2f}"
                                             )
+                                        market_cap = basic_info.get(
+                                            'market_cap', 0)
+                                        if market_cap:
                                             st.write(
-                                                f"**Sector:** {basic_info.get('sector', 'N/A')}"
+                                                f"**Market Cap:** ₹{market_cap/10000000:.1f} Cr"
                                             )
-
-                                        with info_col2:
-                                            pe_ratio = valuation.get(
-                                                'pe_ratio')
-                                            if pe_ratio:
-                                                st.write(
-                                                    f"**P/E Ratio:** {pe_ratio:.2f}"
-                                                )
-                                            market_cap = basic_info.get(
-                                                'market_cap', 0)
-                                            if market_cap:
-                                                st.write(
-                                                    f"**Market Cap:** ₹{market_cap/10000000:.1f} Cr"
-                                                )
-                                else:
-                                    st.error("Unable to fetch historical data")
                             else:
                                 st.error(
                                     f"Unable to fetch price for {symbol_input}"
@@ -591,6 +474,195 @@ def main():
                         except Exception as e:
                             st.error(f"Error fetching data: {str(e)}")
 
+
+def main():
+    # DRAVYUM header for Market Dashboard
+    st.markdown("""
+    <div class="main-header">
+        <h1 style="margin: 0; font-size: 2.5rem;">Market Dashboard</h1>
+        <p style="margin: 0.3rem 0 0 0; opacity: 0.9;">Real-time market intelligence and analysis</p>
+    </div>
+    """,
+                unsafe_allow_html=True)
+
+    # Market status indicator
+    market_status = _market_status()
+
+    col1, col2, col3 = st.columns([1, 1, 2])
+
+    with col1:
+        if market_status.get('is_open', False):
+            st.success("🟢 Market OPEN")
+        else:
+            st.error("🔴 Market CLOSED")
+
+    with col2:
+        st.info(f"🕒 {market_status.get('current_time', 'N/A')}")
+
+    with col3:
+        st.info(f"📅 Next Session: {market_status.get('next_open', 'N/A')}")
+
+    # Main indices overview
+    st.header("📊 Major Indices")
+
+    indices = {
+        "NIFTY 50": "^NSEI",
+        "SENSEX": "^BSESN",
+        "BANK NIFTY": "^NSEBANK",
+        "NIFTY IT": "^CNXIT"
+    }
+
+    # Sample sector indices (in production, this would fetch real sector data)
+    sector_data = {
+        'Bank Nifty': '^NSEBANK',
+        'IT': '^CNXIT',
+        'Auto': '^CNXAUTO',
+        'Pharma': '^CNXPHARMA',
+        'FMCG': '^CNXFMCG'
+    }
+
+    # One request for every index and sector symbol on the page
+    all_symbols = tuple(dict.fromkeys(list(indices.values()) + list(sector_data.values())))
+    try:
+        batch = _batch_history(all_symbols)
+    except Exception as e:
+        logging.warning("Batch index download failed: %s", e)
+        batch = pd.DataFrame()
+    available = _available_symbols(batch)
+
+    # All index cards rendered as one table from the batched closes
+    index_rows = []
+    for name, symbol in indices.items():
+        closes = batch[symbol]['Close'].dropna() if symbol in available else None
+        if closes is not None and len(closes) >= 2:
+            current = closes.iloc[-1]
+            change = current - closes.iloc[-2]
+            index_rows.append((name, current, change, (change / closes.iloc[-2]) * 100))
+        else:
+            index_rows.append((name, np.nan, np.nan, np.nan))
+
+    idx_df = pd.DataFrame(index_rows, columns=['Index', 'Price', 'Δ', 'Δ%'])
+    st.dataframe(idx_df,
+                 hide_index=True,
+                 use_container_width=True,
+                 column_config={
+                     'Price': st.column_config.NumberColumn(format='₹%.2f'),
+                     'Δ': st.column_config.NumberColumn(format='%+.2f'),
+                     'Δ%': st.column_config.NumberColumn(format='%+.2f%%')
+                 })
+
+    _ai_summary_section()
+
+    # Detailed NIFTY analysis
+    st.header("🎯 NIFTY 50 Detailed Analysis")
+
+    try:
+        nifty_data = _nifty_data("3mo")
+
+        if not nifty_data.empty:
+            # Add technical indicators
+            nifty_with_indicators = calculate_technical_indicators(nifty_data)
+
+            col1, col2 = st.columns([2, 1])
+
+            with col1:
+                # Candlestick chart; one 60-bar slice feeds candles and overlays
+                tail = nifty_with_indicators.iloc[-60:]
+                candlestick_fig = create_candlestick_chart(
+                    tail, "NIFTY 50 - Last 60 Days")
+
+                # Add moving averages
+                if 'SMA_20' in tail.columns:
+                    candlestick_fig.add_trace(
+                        go.Scattergl(x=tail.index,
+                                     y=tail['SMA_20'],
+                                     mode='lines',
+                                     name='SMA 20',
+                                     line=dict(color='orange', width=1)))
+
+                if 'SMA_50' in tail.columns:
+                    candlestick_fig.add_trace(
+                        go.Scattergl(x=tail.index,
+                                     y=tail['SMA_50'],
+                                     mode='lines',
+                                     name='SMA 50',
+                                     line=dict(color='blue', width=1)))
+
+                candlestick_fig.update_layout(showlegend=True)
+                st.plotly_chart(candlestick_fig, use_container_width=True)
+
+            with col2:
+                # Key technical levels
+                high_values = nifty_data['High'].to_numpy()
+                low_values = nifty_data['Low'].to_numpy()
+                high_52w = np.nanmax(high_values)
+                low_52w = np.nanmin(low_values)
+
+                st.subheader("📈 Technical Levels")
+                st.metric("52W High", f"₹{high_52w:,.2f}")
+                st.metric("52W Low", f"₹{low_52w:,.2f}")
+
+                if 'RSI' in nifty_with_indicators.columns:
+                    rsi = nifty_with_indicators['RSI'].iloc[-1]
+                    st.metric("RSI (14)", f"{rsi:.1f}")
+
+                # Support/Resistance levels
+                st.subheader("🎯 Key Levels")
+                support = np.nanmin(low_values[-20:])
+                resistance = np.nanmax(high_values[-20:])
+
+                st.metric("Support", f"₹{support:,.2f}")
+                st.metric("Resistance", f"₹{resistance:,.2f}")
+
+            # Volume analysis
+            volume_fig = create_volume_chart(tail)
+            st.plotly_chart(volume_fig, use_container_width=True)
+
+        else:
+            st.error("Unable to fetch NIFTY data")
+
+    except Exception as e:
+        st.error(f"Error in NIFTY analysis: {str(e)}")
+
+    # Top movers section
+    st.header("🔥 Market Movers")
+
+    try:
+        gainers, losers = _top_movers()
+
+        col1, col2 = st.columns(2)
+
+        with col1:
+            st.subheader("🟢 Top Gainers")
+            if not gainers.empty:
+                top_gainers = gainers.head(10).copy()
+                top_gainers.insert(0, "", np.where(top_gainers['Change'] > 0, "🟢", "🔴"))
+                st.dataframe(top_gainers,
+                             use_container_width=True,
+                             column_config=MOVERS_COLUMN_CONFIG)
+            else:
+                st.info("No gainers data available")
+
+        with col2:
+            st.subheader("🔴 Top Losers")
+            if not losers.empty:
+                top_losers = losers.head(10).copy()
+                top_losers.insert(0, "", np.where(top_losers['Change'] < 0, "🔴", "🟢"))
+                st.dataframe(top_losers,
+                             use_container_width=True,
+                             column_config=MOVERS_COLUMN_CONFIG)
+            else:
+                st.info("No losers data available")
+
+    except Exception as e:
+        st.error(f"Error loading top movers: {str(e)}")
+
+    _sector_section(batch, sector_data)
+
+    _breakout_section()
+
+    _lookup_section()
+
     # Auto-refresh option
     st.sidebar.header("⚙️ Dashboard Settings")
 
@@ -599,8 +671,7 @@ def main():
     if auto_refresh:
         st.sidebar.info(
             "Dashboard will refresh automatically every 30 seconds")
-        time.sleep(30)
-        st.rerun()
+        _auto_refresh(time.time())
 
     # Manual refresh button
     if st.sidebar.button("🔄 Refresh Data", use_container_width=True):
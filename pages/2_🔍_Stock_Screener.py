@@ -1,19 +1,12 @@
 import streamlit as st
-import pandas as pd
-import plotly.express as px
-import sys
-import os
+import io
+import json
 from datetime import datetime
 
-# Add the parent directory to the path to import utils
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
-from utils.screener import StockScreener
-
 st.set_page_config(page_title="Stock Screener - TRADESENSEI", page_icon="🥋", layout="wide")
 
-# Add luxury styling
-st.markdown("""
+# Luxury styling, sent together with the page header
+_PAGE_CSS = """
 <style>
     .stApp {
         background-color: #EAEOD5;
@@ -55,21 +48,306 @@ st.markdown("""
         color: #EAEOD5;
     }
 </style>
-""",
-            unsafe_allow_html=True)
+"""
+
+_HEADER_HTML = """
+<div class="main-header">
+    <h1 style="margin: 0; font-size: 2.5rem;">Screeners</h1>
+    <p style="margin: 0.3rem 0 0 0; opacity: 0.9;"> Our Advanced screening tools for Indian markets</p>
+</div>
+"""
+
+
+_SCREEN_METHODS = {
+    "RSI Analysis": "rsi_screen",
+    "Supertrend Signals": "supertrend_screen",
+    "Quarterly Earnings": "quarterly_earnings_screen",
+    "Momentum Stocks": "momentum_screen",
+    "Value Stocks": "value_screen",
+    "Growth Stocks": "growth_screen",
+    "Dividend Stocks": "dividend_screen",
+    "Quality Stocks": "quality_screen"
+}
+
+_STRATEGY_DESCRIPTIONS = {
+    "RSI Analysis":
+    "Find stocks with RSI indicating oversold or overbought conditions for potential reversal trades",
+    "Supertrend Signals":
+    "Identify stocks showing clear buy/sell signals based on Supertrend indicator",
+    "Quarterly Earnings":
+    "Screen stocks with strong quarterly earnings growth and reasonable valuations",
+    "Momentum Stocks":
+    "Stocks showing strong upward price movement with high volume and positive technical indicators",
+    "Value Stocks":
+    "Undervalued stocks with low P/E ratios, good ROE, and dividend yields",
+    "Growth Stocks":
+    "Companies showing strong revenue and earnings growth potential",
+    "Dividend Stocks":
+    "Stocks with consistent dividend payments and good yield",
+    "Quality Stocks":
+    "Companies with strong fundamentals, low debt, and consistent profitability"
+}
+
+_SECTORS = ("Technology", "Banking", "Pharmaceuticals", "Oil & Gas",
+            "Automobiles", "FMCG")
+
+# Columns shown in the results table, in display order
+_RESULT_COLS = ('symbol', 'company_name', 'current_price', 'sector',
+                'financial_score', 'technical_score', 'combined_score',
+                'pe_ratio', 'roe', 'dividend_yield')
+
+_CHART_CONFIG = {'displayModeBar': False}
+
+RESULTS_COLUMN_CONFIG = {
+    'Current Price': st.column_config.NumberColumn(format='%.2f'),
+    'Financial Score': st.column_config.NumberColumn(format='%.1f'),
+    'Technical Score': st.column_config.NumberColumn(format='%.1f'),
+    'Combined Score': st.column_config.NumberColumn(format='%.1f'),
+    'Pe Ratio': st.column_config.NumberColumn(format='%.3f'),
+    'Roe': st.column_config.NumberColumn(format='%.3f'),
+    'Dividend Yield': st.column_config.NumberColumn(format='%.3f')
+}
+
+
+@st.cache_data(ttl=900, show_spinner=False)
+def _run_prebuilt(_screener, strategy, criteria_json):
+    """Run a pre-built screen, cached on strategy and criteria"""
+    screen = getattr(_screener, _SCREEN_METHODS[strategy])
+    criteria = json.loads(criteria_json)
+    return screen(criteria) if criteria else screen()
+
+
+@st.cache_data(ttl=900, show_spinner=False)
+def _run_custom(_screener, criteria_json):
+    """Run a custom screen, cached on its criteria"""
+    return _screener.custom_screen(json.loads(criteria_json))
+
+
+@st.cache_data(ttl=900, show_spinner=False)
+def _run_combined(_screener, fundamental_json, technical_json, weights_json):
+    """Run a combined screen, cached on criteria and weights"""
+    return _screener.combined_screen(json.loads(fundamental_json),
+                                     json.loads(technical_json),
+                                     json.loads(weights_json))
+
+
+@st.cache_data(ttl=900, show_spinner=False)
+def _sector_leaders(_screener, sector):
+    """Top stocks in a sector, cached for 15 minutes"""
+    return _screener.get_sector_leaders(sector)
+
+
+def _sidebar_params_for(strategy):
+    """Sidebar parameter widgets for a pre-built strategy, as criteria"""
+    if strategy == "RSI Analysis":
+        with st.sidebar:
+            st.subheader("RSI Parameters")
+            rsi_condition = st.selectbox("RSI Condition",
+                                         ["oversold", "overbought", "range"])
+            rsi_low = st.slider("RSI Low", 20, 40, 30)
+            rsi_high = st.slider("RSI High", 60, 80, 70)
+
+        return {
+            'rsi_condition': rsi_condition,
+            'rsi_low': rsi_low,
+            'rsi_high': rsi_high
+        }
+
+    if strategy == "Supertrend Signals":
+        with st.sidebar:
+            st.subheader("Supertrend Parameters")
+            signal_type = st.selectbox("Signal Type", ["buy", "sell"])
+
+        return {'signal_type': signal_type}
+
+    if strategy == "Quarterly Earnings":
+        with st.sidebar:
+            st.subheader("Earnings Parameters")
+            min_growth = st.slider("Min Profit Growth (%)", 0, 50, 10)
+            min_revenue_growth = st.slider("Min Revenue Growth (%)", 0, 30, 5)
+            max_pe = st.slider("Max P/E Ratio", 10, 50, 25)
+
+        return {
+            'min_growth': min_growth,
+            'min_revenue_growth': min_revenue_growth,
+            'max_pe': max_pe
+        }
+
+    return {}
+
+
+def _criteria_hash(*inputs):
+    """Stable hash of a screen's inputs"""
+    return hash(json.dumps(inputs, sort_keys=True, default=str))
+
+
+def _inputs_changed(criteria_hash):
+    """True unless these inputs produced the results already on screen"""
+    return (st.session_state.get('last_hash') != criteria_hash
+            or 'screen_results' not in st.session_state)
+
+
+@st.cache_data(ttl=900, max_entries=8, show_spinner=False)
+def _to_csv_bytes(results_hash, _df):
+    """CSV export of a results frame, cached on its content hash"""
+    buf = io.BytesIO()
+    _df.to_csv(buf, index=False)
+    return buf.getvalue()
+
+
+@st.fragment
+def _render_results(screening_type):
+    """Summary metrics, table, charts and export for the last screen"""
+    if 'screen_results' not in st.session_state:
+        return
+
+    st.header(f"📊 {st.session_state.screen_type} Results")
+
+    results = st.session_state.screen_results
+
+    if not results:
+        st.warning(
+            "No stocks found matching the criteria. Try adjusting your filters."
+        )
+        return
+
+    # A single match needs no summary, charts or pandas
+    if len(results) == 1:
+        st.table(results)
+        return
+
+    import pandas as pd
+    import plotly.graph_objects as go
+
+    df_results = pd.DataFrame.from_records(results)
+
+    # Slim a copy for the table and charts; the export keeps full precision.
+    # Large-magnitude columns such as market cap stay float64, since float32
+    # only holds about 7 significant digits
+    df_view = df_results.copy()
+    for col in df_view.select_dtypes('float64').columns:
+        if df_view[col].abs().max() < 1e6:
+            df_view[col] = df_view[col].astype('float32')
+    for col in df_view.select_dtypes('int64').columns:
+        df_view[col] = pd.to_numeric(df_view[col], downcast='integer')
+    if 'sector' in df_view:
+        df_view['sector'] = df_view['sector'].astype('category')
+
+    # Summary metrics
+    col1, col2, col3, col4 = st.columns(4)
+
+    with col1:
+        st.metric("Stocks Found", len(df_results))
+
+    with col2:
+        if screening_type != "Custom Screen" and 'financial_score' in df_results:
+            avg_score = df_results['financial_score'].fillna(0).mean()
+            st.metric("Avg Financial Score", f"{avg_score:.1f}")
+        elif 'combined_score' in df_results:
+            avg_score = df_results['combined_score'].fillna(0).mean()
+            st.metric("Avg Combined Score", f"{avg_score:.1f}")
+        else:
+            st.metric("Avg Tech Score", "N/A")
+
+    with col3:
+        sectors = df_results.get('sector', pd.Series(dtype=object))
+        st.metric("Sectors Covered", sectors[sectors.ne('')].nunique())
+
+    with col4:
+        market_caps = df_results.get('market_cap',
+                                     pd.Series(dtype=float))
+        market_caps = market_caps[market_caps > 0]
+        avg_mcap = market_caps.mean(
+        ) / 10000000 if not market_caps.empty else 0
+        st.metric("Avg Market Cap (Cr)", f"₹{avg_mcap:,.0f}")
+
+    # Results table: select relevant columns and rename for display
+    display_columns = [
+        col for col in _RESULT_COLS if col in df_view.columns
+    ]
+    display_df = df_view[display_columns]
+    display_df.columns = [
+        col.replace('_', ' ').title() for col in display_df.columns
+    ]
+
+    st.dataframe(display_df,
+                 use_container_width=True,
+                 hide_index=True,
+                 column_config=RESULTS_COLUMN_CONFIG)
+
+    # Sector distribution chart
+    if 'sector' in df_view.columns:
+        sector_counts = df_view['sector'].value_counts()
+
+        if len(sector_counts) > 1:
+            fig_sector = go.Figure(data=[
+                go.Pie(values=sector_counts.to_numpy().tolist(),
+                       labels=sector_counts.index.tolist(),
+                       sort=False)
+            ])
+            fig_sector.update_layout(
+                title="Sector Distribution of Screened Stocks")
+            st.plotly_chart(fig_sector,
+                            use_container_width=True,
+                            config=_CHART_CONFIG,
+                            theme=None)
+
+    # Score distribution (if applicable)
+    for score_col in ('financial_score', 'combined_score'):
+        if score_col in df_view.columns:
+            fig_score = go.Figure(data=[
+                go.Histogram(x=df_view[score_col].to_numpy(),
+                             nbinsx=20)
+            ])
+            fig_score.update_layout(
+                title=f"{score_col.split('_')[0].title()} Score Distribution",
+                xaxis_title=score_col)
+            st.plotly_chart(fig_score,
+                            use_container_width=True,
+                            config=_CHART_CONFIG,
+                            theme=None)
+            break
+
+    # Export option
+    if st.button("📥 Export Results to CSV"):
+        results_hash = hash(
+            pd.util.hash_pandas_object(df_results).values.tobytes())
+        st.download_button(
+            label="Download CSV",
+            data=_to_csv_bytes(results_hash, df_results),
+            file_name=
+            f"screener_results_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
+            mime="text/csv")
+
+
+@st.fragment
+def _screening_tips():
+    """Sidebar expander with screening tips"""
+    with st.expander("💡 Screening Tips"):
+        st.markdown("""
+        **Momentum Screening:**
+        - Look for stocks breaking above resistance
+        - High volume confirms strong moves
+        - RSI between 50-70 shows healthy momentum
+        
+        **Value Screening:**
+        - Low P/E ratios may indicate undervaluation
+        - Check debt levels for financial stability
+        - Dividend yield adds income component
+        
+        **Growth Screening:**
+        - Revenue growth shows business expansion
+        - ROE indicates efficient capital use
+        - Consider sector trends and competition
+        """)
 
 
 def main():
-    st.markdown("""
-    <div class="main-header">
-        <h1 style="margin: 0; font-size: 2.5rem;">Screeners</h1>
-        <p style="margin: 0.3rem 0 0 0; opacity: 0.9;"> Our Advanced screening tools for Indian markets</p>
-    </div>
-    """,
-                unsafe_allow_html=True)
+    st.markdown(_PAGE_CSS + _HEADER_HTML, unsafe_allow_html=True)
 
     # Initialize screener
     if 'screener' not in st.session_state:
+        from utils.screener import StockScreener
         st.session_state.screener = StockScreener()
 
     screener = st.session_state.screener
@@ -89,205 +367,141 @@ def main():
             "Dividend Stocks", "Quality Stocks"
         ])
 
+        # Strategy parameters live in the sidebar, declared before the run
+        criteria = _sidebar_params_for(strategy)
+
         col1, col2 = st.columns([3, 1])
 
         with col2:
             if st.button("🔍 Run Screen", use_container_width=True):
                 with st.spinner(f"Screening for {strategy.lower()}..."):
                     try:
-                        if strategy == "RSI Analysis":
-                            # Get RSI parameters from sidebar
-                            with st.sidebar:
-                                st.subheader("RSI Parameters")
-                                rsi_condition = st.selectbox(
-                                    "RSI Condition",
-                                    ["oversold", "overbought", "range"])
-                                rsi_low = st.slider("RSI Low", 20, 40, 30)
-                                rsi_high = st.slider("RSI High", 60, 80, 70)
-
-                            criteria = {
-                                'rsi_condition': rsi_condition,
-                                'rsi_low': rsi_low,
-                                'rsi_high': rsi_high
-                            }
-                            results = screener.rsi_screen(criteria)
-
-                        elif strategy == "Supertrend Signals":
-                            # Get Supertrend parameters
-                            with st.sidebar:
-                                st.subheader("Supertrend Parameters")
-                                signal_type = st.selectbox(
-                                    "Signal Type", ["buy", "sell"])
-
-                            criteria = {'signal_type': signal_type}
-                            results = screener.supertrend_screen(criteria)
-
-                        elif strategy == "Quarterly Earnings":
-                            # Get earnings parameters
-                            with st.sidebar:
-                                st.subheader("Earnings Parameters")
-                                min_growth = st.slider("Min Profit Growth (%)",
-                                                       0, 50, 10)
-                                min_revenue_growth = st.slider(
-                                    "Min Revenue Growth (%)", 0, 30, 5)
-                                max_pe = st.slider("Max P/E Ratio", 10, 50, 25)
-
-                            criteria = {
-                                'min_growth': min_growth,
-                                'min_revenue_growth': min_revenue_growth,
-                                'max_pe': max_pe
-                            }
-                            results = screener.quarterly_earnings_screen(
-                                criteria)
-
-                        elif strategy == "Momentum Stocks":
-                            results = screener.momentum_screen()
-                        elif strategy == "Value Stocks":
-                            results = screener.value_screen()
-                        elif strategy == "Growth Stocks":
-                            results = screener.growth_screen()
-                        elif strategy == "Dividend Stocks":
-                            results = screener.dividend_screen()
-                        elif strategy == "Quality Stocks":
-                            results = screener.quality_screen()
+                        h = _criteria_hash(strategy, criteria)
+                        if _inputs_changed(h):
+                            results = _run_prebuilt(
+                                screener, strategy,
+                                json.dumps(criteria, sort_keys=True))
 
-                        st.session_state.screen_results = results
-                        st.session_state.screen_type = strategy
+                            st.session_state.screen_results = results
+                            st.session_state.screen_type = strategy
+                            st.session_state.last_hash = h
 
                     except Exception as e:
                         st.error(f"Error running screen: {str(e)}")
 
         # Strategy descriptions
         with col1:
-            strategy_descriptions = {
-                "RSI Analysis":
-                "Find stocks with RSI indicating oversold or overbought conditions for potential reversal trades",
-                "Supertrend Signals":
-                "Identify stocks showing clear buy/sell signals based on Supertrend indicator",
-                "Quarterly Earnings":
-                "Screen stocks with strong quarterly earnings growth and reasonable valuations",
-                "Momentum Stocks":
-                "Stocks showing strong upward price movement with high volume and positive technical indicators",
-                "Value Stocks":
-                "Undervalued stocks with low P/E ratios, good ROE, and dividend yields",
-                "Growth Stocks":
-                "Companies showing strong revenue and earnings growth potential",
-                "Dividend Stocks":
-                "Stocks with consistent dividend payments and good yield",
-                "Quality Stocks":
-                "Companies with strong fundamentals, low debt, and consistent profitability"
-            }
-
-            st.info(strategy_descriptions.get(strategy, ""))
+            st.info(_STRATEGY_DESCRIPTIONS.get(strategy, ""))
 
     elif screening_type == "Custom Screen":
         st.header("⚙️ Custom Screening Criteria")
 
-        # Create tabs for different criteria types
-        tab1, tab2 = st.tabs(
-            ["📊 Fundamental Criteria", "📈 Technical Criteria"])
-
-        with tab1:
-            st.subheader("Fundamental Filters")
-
-            col1, col2, col3 = st.columns(3)
-
-            with col1:
-                st.write("**Valuation Metrics**")
-                min_market_cap = st.number_input(
-                    "Min Market Cap (Cr)", min_value=0, value=100) * 10000000
-                max_market_cap = st.number_input("Max Market Cap (Cr)",
+        with st.form(key='custom_screen_form'):
+            # Create tabs for different criteria types
+            tab1, tab2 = st.tabs(
+                ["📊 Fundamental Criteria", "📈 Technical Criteria"])
+
+            with tab1:
+                st.subheader("Fundamental Filters")
+
+                col1, col2, col3 = st.columns(3)
+
+                with col1:
+                    st.write("**Valuation Metrics**")
+                    min_market_cap = st.number_input(
+                        "Min Market Cap (Cr)", min_value=0, value=100) * 10000000
+                    max_market_cap = st.number_input("Max Market Cap (Cr)",
+                                                     min_value=0,
+                                                     value=100000) * 10000000
+                    min_pe = st.number_input("Min P/E Ratio",
+                                             min_value=0.0,
+                                             value=5.0,
+                                             step=0.1)
+                    max_pe = st.number_input("Max P/E Ratio",
+                                             min_value=0.0,
+                                             value=50.0,
+                                             step=0.1)
+
+                with col2:
+                    st.write("**Profitability Metrics**")
+                    min_roe = st.number_input(
+                        "Min ROE (%)", min_value=0.0, value=10.0, step=0.1) / 100
+                    min_profit_margin = st.number_input("Min Profit Margin (%)",
+                                                        min_value=0.0,
+                                                        value=5.0,
+                                                        step=0.1) / 100
+                    max_debt_equity = st.number_input("Max Debt/Equity",
+                                                      min_value=0.0,
+                                                      value=2.0,
+                                                      step=0.1)
+
+                with col3:
+                    st.write("**Growth & Dividend**")
+                    min_revenue_growth = st.number_input(
+                        "Min Revenue Growth (%)", value=-50.0, step=1.0) / 100
+                    dividend_required = st.checkbox("Must pay dividends")
+
+                    # Sector filter
+                    sectors = st.multiselect("Filter by Sectors:", _SECTORS)
+
+                # Build fundamental criteria
+                fundamental_criteria = {
+                    'min_market_cap': min_market_cap,
+                    'max_market_cap': max_market_cap,
+                    'min_pe_ratio': min_pe,
+                    'max_pe_ratio': max_pe,
+                    'min_roe': min_roe,
+                    'min_profit_margin': min_profit_margin,
+                    'max_debt_to_equity': max_debt_equity,
+                    'min_revenue_growth': min_revenue_growth,
+                    'dividend_yield': dividend_required,
+                    'sectors': sectors if sectors else None
+                }
+
+            with tab2:
+                st.subheader("Technical Filters")
+
+                col1, col2 = st.columns(2)
+
+                with col1:
+                    st.write("**Price Action**")
+                    price_above_sma20 = st.checkbox("Price above SMA 20")
+                    price_above_sma50 = st.checkbox("Price above SMA 50")
+                    macd_bullish = st.checkbox("MACD Bullish Signal")
+                    breakout_pattern = st.checkbox("Recent Breakout")
+
+                with col2:
+                    st.write("**Momentum Indicators**")
+                    rsi_min = st.number_input("Min RSI",
+                                              min_value=0,
+                                              max_value=100,
+                                              value=30)
+                    rsi_max = st.number_input("Max RSI",
+                                              min_value=0,
+                                              max_value=100,
+                                              value=70)
+                    volume_spike = st.checkbox("Volume Spike (1.5x avg)")
+                    min_volume = st.number_input("Min Daily Volume",
                                                  min_value=0,
-                                                 value=100000) * 10000000
-                min_pe = st.number_input("Min P/E Ratio",
-                                         min_value=0.0,
-                                         value=5.0,
-                                         step=0.1)
-                max_pe = st.number_input("Max P/E Ratio",
-                                         min_value=0.0,
-                                         value=50.0,
-                                         step=0.1)
-
-            with col2:
-                st.write("**Profitability Metrics**")
-                min_roe = st.number_input(
-                    "Min ROE (%)", min_value=0.0, value=10.0, step=0.1) / 100
-                min_profit_margin = st.number_input("Min Profit Margin (%)",
-                                                    min_value=0.0,
-                                                    value=5.0,
-                                                    step=0.1) / 100
-                max_debt_equity = st.number_input("Max Debt/Equity",
-                                                  min_value=0.0,
-                                                  value=2.0,
-                                                  step=0.1)
-
-            with col3:
-                st.write("**Growth & Dividend**")
-                min_revenue_growth = st.number_input(
-                    "Min Revenue Growth (%)", value=-50.0, step=1.0) / 100
-                dividend_required = st.checkbox("Must pay dividends")
-
-                # Sector filter
-                sectors = st.multiselect("Filter by Sectors:", [
-                    "Technology", "Banking", "Pharmaceuticals", "Oil & Gas",
-                    "Automobiles", "FMCG"
-                ])
-
-            # Build fundamental criteria
-            fundamental_criteria = {
-                'min_market_cap': min_market_cap,
-                'max_market_cap': max_market_cap,
-                'min_pe_ratio': min_pe,
-                'max_pe_ratio': max_pe,
-                'min_roe': min_roe,
-                'min_profit_margin': min_profit_margin,
-                'max_debt_to_equity': max_debt_equity,
-                'min_revenue_growth': min_revenue_growth,
-                'dividend_yield': dividend_required,
-                'sectors': sectors if sectors else None
-            }
-
-        with tab2:
-            st.subheader("Technical Filters")
-
-            col1, col2 = st.columns(2)
-
-            with col1:
-                st.write("**Price Action**")
-                price_above_sma20 = st.checkbox("Price above SMA 20")
-                price_above_sma50 = st.checkbox("Price above SMA 50")
-                macd_bullish = st.checkbox("MACD Bullish Signal")
-                breakout_pattern = st.checkbox("Recent Breakout")
-
-            with col2:
-                st.write("**Momentum Indicators**")
-                rsi_min = st.number_input("Min RSI",
-                                          min_value=0,
-                                          max_value=100,
-                                          value=30)
-                rsi_max = st.number_input("Max RSI",
-                                          min_value=0,
-                                          max_value=100,
-                                          value=70)
-                volume_spike = st.checkbox("Volume Spike (1.5x avg)")
-                min_volume = st.number_input("Min Daily Volume",
-                                             min_value=0,
-                                             value=100000)
-
-            # Build technical criteria
-            technical_criteria = {
-                'price_above_sma20': price_above_sma20,
-                'price_above_sma50': price_above_sma50,
-                'macd_bullish': macd_bullish,
-                'breakout_pattern': breakout_pattern,
-                'rsi_min': rsi_min,
-                'rsi_max': rsi_max,
-                'volume_spike': volume_spike,
-                'min_volume': min_volume
-            }
+                                                 value=100000)
+
+                # Build technical criteria
+                technical_criteria = {
+                    'price_above_sma20': price_above_sma20,
+                    'price_above_sma50': price_above_sma50,
+                    'macd_bullish': macd_bullish,
+                    'breakout_pattern': breakout_pattern,
+                    'rsi_min': rsi_min,
+                    'rsi_max': rsi_max,
+                    'volume_spike': volume_spike,
+                    'min_volume': min_volume
+                }
+
+            submitted = st.form_submit_button("🔍 Run Custom Screen",
+                                              use_container_width=True)
 
         # Run custom screen
-        if st.button("🔍 Run Custom Screen", use_container_width=True):
+        if submitted:
             with st.spinner("Running custom screen..."):
                 try:
                     # Combine criteria
@@ -295,10 +509,15 @@ def main():
                         **fundamental_criteria,
                         **technical_criteria
                     }
-                    results = screener.custom_screen(custom_criteria)
+                    h = _criteria_hash("Custom Screen", custom_criteria)
+                    if _inputs_changed(h):
+                        results = _run_custom(
+                            screener,
+                            json.dumps(custom_criteria, sort_keys=True))
 
-                    st.session_state.screen_results = results
-                    st.session_state.screen_type = "Custom Screen"
+                        st.session_state.screen_results = results
+                        st.session_state.screen_type = "Custom Screen"
+                        st.session_state.last_hash = h
 
                 except Exception as e:
                     st.error(f"Error running custom screen: {str(e)}")
@@ -306,42 +525,46 @@ def main():
     elif screening_type == "Combined Screen":
         st.header("🔄 Combined Fundamental & Technical Screen")
 
-        col1, col2 = st.columns(2)
+        with st.form(key='combined_screen_form'):
+            col1, col2 = st.columns(2)
 
-        with col1:
-            st.subheader("📊 Fundamental Criteria")
-            fund_min_roe = st.number_input("Min ROE (%)", value=12.0) / 100
-            fund_max_pe = st.number_input("Max P/E Ratio", value=25.0)
-            fund_min_growth = st.number_input("Min Revenue Growth (%)",
-                                              value=5.0) / 100
-
-            fundamental_criteria = {
-                'min_roe': fund_min_roe,
-                'max_pe_ratio': fund_max_pe,
-                'min_revenue_growth': fund_min_growth
-            }
+            with col1:
+                st.subheader("📊 Fundamental Criteria")
+                fund_min_roe = st.number_input("Min ROE (%)", value=12.0) / 100
+                fund_max_pe = st.number_input("Max P/E Ratio", value=25.0)
+                fund_min_growth = st.number_input("Min Revenue Growth (%)",
+                                                  value=5.0) / 100
+
+                fundamental_criteria = {
+                    'min_roe': fund_min_roe,
+                    'max_pe_ratio': fund_max_pe,
+                    'min_revenue_growth': fund_min_growth
+                }
 
-        with col2:
-            st.subheader("📈 Technical Criteria")
-            tech_price_sma20 = st.checkbox("Price above SMA 20", value=True)
-            tech_rsi_range = st.slider("RSI Range", 0, 100, (40, 70))
-            tech_macd = st.checkbox("MACD Bullish")
-
-            technical_criteria = {
-                'price_above_sma20': tech_price_sma20,
-                'rsi_min': tech_rsi_range[0],
-                'rsi_max': tech_rsi_range[1],
-                'macd_bullish': tech_macd
-            }
-
-        # Weighting
-        st.subheader("⚖️ Scoring Weights")
-        col1, col2 = st.columns(2)
+            with col2:
+                st.subheader("📈 Technical Criteria")
+                tech_price_sma20 = st.checkbox("Price above SMA 20", value=True)
+                tech_rsi_range = st.slider("RSI Range", 0, 100, (40, 70))
+                tech_macd = st.checkbox("MACD Bullish")
+
+                technical_criteria = {
+                    'price_above_sma20': tech_price_sma20,
+                    'rsi_min': tech_rsi_range[0],
+                    'rsi_max': tech_rsi_range[1],
+                    'macd_bullish': tech_macd
+                }
+
+            # Weighting
+            st.subheader("⚖️ Scoring Weights")
+            col1, col2 = st.columns(2)
 
-        with col1:
-            fund_weight = st.slider("Fundamental Weight", 0.0, 1.0, 0.6, 0.1)
-        with col2:
-            tech_weight = st.slider("Technical Weight", 0.0, 1.0, 0.4, 0.1)
+            with col1:
+                fund_weight = st.slider("Fundamental Weight", 0.0, 1.0, 0.6, 0.1)
+            with col2:
+                tech_weight = st.slider("Technical Weight", 0.0, 1.0, 0.4, 0.1)
+
+            submitted = st.form_submit_button("🔍 Run Combined Screen",
+                                              use_container_width=True)
 
         # Normalize weights
         total_weight = fund_weight + tech_weight
@@ -351,162 +574,45 @@ def main():
 
         weights = {'fundamental': fund_weight, 'technical': tech_weight}
 
-        if st.button("🔍 Run Combined Screen", use_container_width=True):
+        if submitted:
             with st.spinner("Running combined screen..."):
                 try:
-                    results = screener.combined_screen(fundamental_criteria,
-                                                       technical_criteria,
-                                                       weights)
+                    h = _criteria_hash("Combined Screen", fundamental_criteria,
+                                       technical_criteria, weights)
+                    if _inputs_changed(h):
+                        results = _run_combined(
+                            screener,
+                            json.dumps(fundamental_criteria, sort_keys=True),
+                            json.dumps(technical_criteria, sort_keys=True),
+                            json.dumps(weights, sort_keys=True))
 
-                    st.session_state.screen_results = results
-                    st.session_state.screen_type = "Combined Screen"
+                        st.session_state.screen_results = results
+                        st.session_state.screen_type = "Combined Screen"
+                        st.session_state.last_hash = h
 
                 except Exception as e:
                     st.error(f"Error running combined screen: {str(e)}")
 
     # Display results
-    if hasattr(st.session_state,
-               'screen_results') and st.session_state.screen_results:
-        st.header(f"📊 {st.session_state.screen_type} Results")
-
-        results = st.session_state.screen_results
-
-        if results:
-            # Summary metrics
-            col1, col2, col3, col4 = st.columns(4)
-
-            with col1:
-                st.metric("Stocks Found", len(results))
-
-            with col2:
-                if screening_type != "Custom Screen" and 'financial_score' in results[
-                        0]:
-                    avg_score = sum(
-                        r.get('financial_score', 0)
-                        for r in results) / len(results)
-                    st.metric("Avg Financial Score", f"{avg_score:.1f}")
-                elif 'combined_score' in results[0]:
-                    avg_score = sum(
-                        r.get('combined_score', 0)
-                        for r in results) / len(results)
-                    st.metric("Avg Combined Score", f"{avg_score:.1f}")
-                else:
-                    st.metric("Avg Tech Score", "N/A")
-
-            with col3:
-                sectors = [
-                    r.get('sector', 'Unknown') for r in results
-                    if r.get('sector')
-                ]
-                unique_sectors = len(set(sectors)) if sectors else 0
-                st.metric("Sectors Covered", unique_sectors)
-
-            with col4:
-                market_caps = [
-                    r.get('market_cap', 0) for r in results
-                    if r.get('market_cap', 0) > 0
-                ]
-                avg_mcap = sum(market_caps) / len(
-                    market_caps) / 10000000 if market_caps else 0
-                st.metric("Avg Market Cap (Cr)", f"₹{avg_mcap:,.0f}")
-
-            # Results table
-            df_results = pd.DataFrame(results)
-
-            # Select relevant columns for display
-            display_columns = ['symbol', 'current_price']
-
-            if 'company_name' in df_results.columns:
-                display_columns.insert(1, 'company_name')
-            if 'sector' in df_results.columns:
-                display_columns.append('sector')
-            if 'financial_score' in df_results.columns:
-                display_columns.append('financial_score')
-            if 'technical_score' in df_results.columns:
-                display_columns.append('technical_score')
-            if 'combined_score' in df_results.columns:
-                display_columns.append('combined_score')
-            if 'pe_ratio' in df_results.columns:
-                display_columns.append('pe_ratio')
-            if 'roe' in df_results.columns:
-                display_columns.append('roe')
-            if 'dividend_yield' in df_results.columns:
-                display_columns.append('dividend_yield')
-
-            # Filter and rename columns
-            display_df = df_results[display_columns].copy()
-            display_df.columns = [
-                col.replace('_', ' ').title() for col in display_df.columns
-            ]
-
-            # Format numeric columns
-            numeric_columns = display_df.select_dtypes(
-                include=['float64', 'int64']).columns
-            for col in numeric_columns:
-                if 'Score' in col:
-                    display_df[col] = display_df[col].round(1)
-                elif 'Price' in col:
-                    display_df[col] = display_df[col].round(2)
-                elif 'Ratio' in col or 'Roe' in col or 'Yield' in col:
-                    display_df[col] = display_df[col].round(3)
-
-            st.dataframe(display_df, use_container_width=True, hide_index=True)
-
-            # Sector distribution chart
-            if 'sector' in df_results.columns:
-                sector_counts = df_results['sector'].value_counts()
-
-                if len(sector_counts) > 1:
-                    fig_sector = px.pie(
-                        values=sector_counts.values,
-                        names=sector_counts.index,
-                        title="Sector Distribution of Screened Stocks")
-                    st.plotly_chart(fig_sector, use_container_width=True)
-
-            # Score distribution (if applicable)
-            if 'financial_score' in df_results.columns:
-                fig_score = px.histogram(df_results,
-                                         x='financial_score',
-                                         title="Financial Score Distribution",
-                                         nbins=20)
-                st.plotly_chart(fig_score, use_container_width=True)
-            elif 'combined_score' in df_results.columns:
-                fig_score = px.histogram(df_results,
-                                         x='combined_score',
-                                         title="Combined Score Distribution",
-                                         nbins=20)
-                st.plotly_chart(fig_score, use_container_width=True)
-
-            # Export option
-            if st.button("📥 Export Results to CSV"):
-                csv = df_results.to_csv(index=False)
-                st.download_button(
-                    label="Download CSV",
-                    data=csv,
-                    file_name=
-                    f"screener_results_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
-                    mime="text/csv")
-        else:
-            st.warning(
-                "No stocks found matching the criteria. Try adjusting your filters."
-            )
+    _render_results(screening_type)
 
     # Sector-specific screening
     st.sidebar.header("🏭 Sector Analysis")
 
-    selected_sector = st.sidebar.selectbox("Analyze Sector Leaders:", [
-        "Technology", "Banking", "Pharmaceuticals", "Oil & Gas", "Automobiles",
-        "FMCG"
-    ])
+    selected_sector = st.sidebar.selectbox("Analyze Sector Leaders:",
+                                           _SECTORS)
 
-    if st.sidebar.button("Analyze Sector", use_container_width=True):
+    sector_hash = _criteria_hash("Sector Leaders", selected_sector)
+    analyze = st.sidebar.button("Analyze Sector", use_container_width=True)
+    if analyze and _inputs_changed(sector_hash):
         with st.spinner(f"Analyzing {selected_sector} sector..."):
             try:
-                sector_leaders = screener.get_sector_leaders(selected_sector)
+                sector_leaders = _sector_leaders(screener, selected_sector)
 
                 if sector_leaders:
                     st.session_state.screen_results = sector_leaders
                     st.session_state.screen_type = f"{selected_sector} Leaders"
+                    st.session_state.last_hash = sector_hash
                     st.rerun()
                 else:
                     st.sidebar.error(
@@ -516,31 +622,18 @@ def main():
                 st.sidebar.error(f"Error analyzing sector: {str(e)}")
 
     # Screening tips
-    with st.sidebar.expander("💡 Screening Tips"):
-        st.markdown("""
-        **Momentum Screening:**
-        - Look for stocks breaking above resistance
-        - High volume confirms strong moves
-        - RSI between 50-70 shows healthy momentum
-        
-        **Value Screening:**
-        - Low P/E ratios may indicate undervaluation
-        - Check debt levels for financial stability
-        - Dividend yield adds income component
-        
-        **Growth Screening:**
-        - Revenue growth shows business expansion
-        - ROE indicates efficient capital use
-        - Consider sector trends and competition
-        """)
+    with st.sidebar:
+        _screening_tips()
 
     # Last update info
     st.sidebar.markdown(
         f"**Last updated:** {datetime.now().strftime('%H:%M:%S')}")
 
     if st.sidebar.button("🔄 Refresh Data", use_container_width=True):
-        # Clear cache and rerun
-        if hasattr(st.session_state, 'screener'):
+        # Clear cached screens and stock data, then rerun
+        st.cache_data.clear()
+        st.session_state.pop('last_hash', None)
+        if 'screener' in st.session_state:
             st.session_state.screener.cache.clear()
         st.rerun()
 
@@ -1,7 +1,7 @@
 import streamlit as st
+import json
 import pandas as pd
-import plotly.graph_objects as go
-import plotly.express as px
+import numpy as np
 from datetime import datetime, timedelta
 import sys
 import os
@@ -10,19 +10,23 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from utils.portfolio import Portfolio
-from utils.market_data import get_real_time_price, get_stock_data
+from utils.market_data import get_stock_data
 from utils.fundamentals import get_fundamental_data
+from utils._njit import njit
 
 st.set_page_config(page_title="Portfolio Tracker - TRADESENSEI",
                    page_icon="🥋",
                    layout="wide")
 
 
+@st.cache_resource(show_spinner=False, max_entries=16)
 def create_portfolio_pie_chart(sector_allocation):
     """Create pie chart for sector allocation"""
     if not sector_allocation:
         return None
 
+    import plotly.graph_objects as go
+
     sectors = list(sector_allocation.keys())
     values = [sector_allocation[sector]['value'] for sector in sectors]
 
@@ -34,14 +38,17 @@ def create_portfolio_pie_chart(sector_allocation):
     return fig
 
 
+@st.cache_resource(show_spinner=False, max_entries=16)
 def create_performance_chart(performance_history):
     """Create portfolio performance timeline chart"""
     if not performance_history or 'portfolio_timeline' not in performance_history:
         return None
 
-    timeline_data = performance_history['portfolio_timeline']
-    dates = list(timeline_data.keys())
-    values = list(timeline_data.values())
+    import plotly.graph_objects as go
+
+    timeline = pd.Series(performance_history['portfolio_timeline'])
+    dates = timeline.index
+    values = timeline.to_numpy()
 
     fig = go.Figure()
 
@@ -60,6 +67,147 @@ def create_performance_chart(performance_history):
     return fig
 
 
+# Gain/loss markers indexed by the codes _sign_codes writes
+_SIGN_MARKERS = np.array(['⚪', '🟢', '🔴'])
+
+# Arrow-native number formatting for the holdings and watchlist tables
+HOLDINGS_COLUMN_CONFIG = {
+    'Buy Price': st.column_config.NumberColumn(format='₹%.2f'),
+    'Current Price': st.column_config.NumberColumn(format='₹%.2f'),
+    'Invested': st.column_config.NumberColumn(format='₹%.2f'),
+    'Current Value': st.column_config.NumberColumn(format='₹%.2f'),
+    'P&L': st.column_config.NumberColumn(format='₹%.2f'),
+    'P&L %': st.column_config.NumberColumn(format='%+.2f%%')
+}
+
+# Record layouts for the summary and watchlist tables, so pandas doesn't
+# have to infer a dtype per column
+_HOLDINGS_PERF_DTYPES = {
+    'symbol': 'object',
+    'quantity': 'int32',
+    'buy_price': 'float64',
+    'current_price': 'float64',
+    'invested_amount': 'float64',
+    'current_value': 'float64',
+    'pnl': 'float64',
+    'pnl_percent': 'float64'
+}
+
+_WATCHLIST_DTYPES = {
+    'symbol': 'object',
+    'company_name': 'object',
+    'current_price': 'float64',
+    'change': 'float64',
+    'change_percent': 'float64',
+    'sector': 'object',
+    'market_cap': 'float64'
+}
+
+MANAGE_HOLDINGS_COLUMN_CONFIG = {
+    'Buy Price': st.column_config.NumberColumn(format='₹%.2f'),
+    'Current Price': st.column_config.NumberColumn(format='₹%.2f'),
+    'P&L': st.column_config.NumberColumn(format='₹%.2f'),
+    'P&L %': st.column_config.NumberColumn(format='%+.2f%%'),
+    'Reduce by': st.column_config.NumberColumn(min_value=0, step=1),
+    'Remove': st.column_config.CheckboxColumn()
+}
+
+WATCHLIST_COLUMN_CONFIG = {
+    'Price': st.column_config.NumberColumn(format='₹%.2f'),
+    'Change': st.column_config.NumberColumn(format='%+.2f'),
+    'Change %': st.column_config.NumberColumn(format='%+.2f%%')
+}
+
+
+@njit(cache=True)
+def _sign_codes(values, out):
+    """Marker code per value: 1 for gains, 2 for losses, 0 for flat or NaN"""
+    for i in range(len(values)):
+        if values[i] > 0:
+            out[i] = 1
+        elif values[i] < 0:
+            out[i] = 2
+        else:
+            out[i] = 0
+
+
+@st.cache_resource(show_spinner=False)
+def _warm_kernels():
+    """Compile the marker kernel once per process"""
+    _sign_codes(np.zeros(1), np.empty(1, dtype=np.int8))
+    return True
+
+
+def _sign_markers(values):
+    """Green/red marker per row from the sign of a numeric column"""
+    codes = np.empty(len(values), dtype=np.int8)
+    _sign_codes(values.to_numpy(dtype=np.float64), codes)
+    return _SIGN_MARKERS[codes]
+
+
+def _portfolio_sig(portfolio):
+    """Hashable signature of the holdings, used as the cache key"""
+    return (portfolio.portfolio_file,
+            tuple((h['symbol'], h['quantity'], h['buy_price'])
+                  for h in portfolio.holdings))
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _summary(_portfolio, sig):
+    """Portfolio summary, cached per holdings signature"""
+    return _portfolio.get_portfolio_summary()
+
+
+# Summary totals shown as metric cards, in _summary_strings argument order
+_SUMMARY_TOTALS = ('total_value', 'total_invested', 'total_pnl',
+                   'total_pnl_percent')
+
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def _summary_strings(total_value, total_invested, total_pnl,
+                     total_pnl_percent):
+    """Display strings for the summary metrics, formatted once per set of totals"""
+    return {
+        'total_value': f"₹{total_value:,.2f}",
+        'total_invested': f"₹{total_invested:,.2f}",
+        'total_pnl': f"₹{total_pnl:,.2f}",
+        'total_pnl_percent': f"{total_pnl_percent:+.2f}%"
+    }
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _sector_allocation(_portfolio, sig):
+    """Sector allocation, cached per holdings signature"""
+    return _portfolio.get_sector_allocation()
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _performance_history(_portfolio, sig):
+    """Performance history, cached per holdings signature"""
+    return _portfolio.get_portfolio_performance_history()
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _recommendations(_portfolio, sig):
+    """Portfolio recommendations, cached per holdings signature"""
+    return _portfolio.get_portfolio_recommendations()
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _watchlist_data(_portfolio, watchlist):
+    """Watchlist quotes, cached per watched symbols"""
+    return _portfolio.get_watchlist_data()
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _risk(_portfolio, sig):
+    """Portfolio risk metrics, cached per holdings signature"""
+    return _portfolio.calculate_portfolio_risk()
+
+
+# Compile the marker kernel up front instead of on the first table render
+_warm_kernels()
+
 # Add luxury styling
 st.markdown("""
 <style>
@@ -107,547 +255,567 @@ st.markdown("""
             unsafe_allow_html=True)
 
 
-def main():
-    st.markdown("""
-    <div class="main-header">
-        <h1 style="margin: 0; font-size: 2.5rem;">Portfolio Tracker</h1>
-        <p style="margin: 0.3rem 0 0 0; opacity: 0.9;">Monitor and manage your investment portfolio</p>
-    </div>
-    """,
-                unsafe_allow_html=True)
-
-    # Initialize portfolio
-    if 'portfolio' not in st.session_state:
-        st.session_state.portfolio = Portfolio()
+@st.fragment
+def _render_overview(portfolio, sig, portfolio_summary):
+    """Overview tab: key metrics, charts, holdings table and recommendations"""
+    st.header("Portfolio Overview")
 
-    portfolio = st.session_state.portfolio
+    if portfolio_summary.get('holdings_count', 0) > 0:
+        # Key metrics
+        summary_text = _summary_strings(
+            *map(portfolio_summary.get, _SUMMARY_TOTALS))
+        col1, col2, col3, col4 = st.columns(4)
 
-    # Tab layout
-    tab1, tab2, tab3, tab4 = st.tabs(
-        ["📈 Overview", "💼 Holdings", "👁️ Watchlist", "⚖️ Risk Analysis"])
+        with col1:
+            st.metric("Total Value",
+                      summary_text['total_value'],
+                      help="Current market value of all holdings")
 
-    with tab1:
-        st.header("Portfolio Overview")
+        with col2:
+            st.metric("Total Invested",
+                      summary_text['total_invested'],
+                      help="Total amount invested")
 
-        # Get portfolio summary
-        portfolio_summary = portfolio.get_portfolio_summary()
+        with col3:
+            st.metric("Total P&L",
+                      summary_text['total_pnl'],
+                      delta=summary_text['total_pnl_percent'],
+                      help="Profit/Loss since investment")
 
-        if portfolio_summary.get('holdings_count', 0) > 0:
-            # Key metrics
-            col1, col2, col3, col4 = st.columns(4)
+        with col4:
+            st.metric("Holdings",
+                      portfolio_summary['holdings_count'],
+                      help="Number of stocks in portfolio")
 
-            with col1:
-                st.metric("Total Value",
-                          f"₹{portfolio_summary['total_value']:,.2f}",
-                          help="Current market value of all holdings")
+        # Performance charts
+        col1, col2 = st.columns(2)
 
-            with col2:
-                st.metric("Total Invested",
-                          f"₹{portfolio_summary['total_invested']:,.2f}",
-                          help="Total amount invested")
+        with col1:
+            # Sector allocation
+            sector_allocation = _sector_allocation(portfolio, sig)
+            pie_chart = create_portfolio_pie_chart(sector_allocation)
 
-            with col3:
-                pnl = portfolio_summary['total_pnl']
-                pnl_pct = portfolio_summary['total_pnl_percent']
-                st.metric("Total P&L",
-                          f"₹{pnl:,.2f}",
-                          delta=f"{pnl_pct:+.2f}%",
-                          help="Profit/Loss since investment")
+            if pie_chart:
+                st.plotly_chart(pie_chart, use_container_width=True)
+            else:
+                st.info("Sector allocation data not available")
 
-            with col4:
-                st.metric("Holdings",
-                          portfolio_summary['holdings_count'],
-                          help="Number of stocks in portfolio")
+        with col2:
+            # Performance history
+            performance_history = _performance_history(portfolio, sig)
+            perf_chart = create_performance_chart(performance_history)
 
-            # Performance charts
+            if perf_chart:
+                st.plotly_chart(perf_chart, use_container_width=True)
+            else:
+                st.info("Performance history not available")
+
+        # Holdings performance table
+        st.subheader("📋 Holdings Performance")
+
+        holdings_perf = portfolio_summary.get('holdings_performance', [])
+
+        if holdings_perf:
+            # Typed display columns straight from the summary records
+            display_df = pd.DataFrame.from_records(
+                holdings_perf,
+                columns=list(_HOLDINGS_PERF_DTYPES)).astype(
+                    _HOLDINGS_PERF_DTYPES)
+
+            display_df.columns = [
+                'Symbol', 'Quantity', 'Buy Price', 'Current Price',
+                'Invested', 'Current Value', 'P&L', 'P&L %'
+            ]
+
+            # Gain/loss marker instead of per-cell styling
+            display_df.insert(0, "", _sign_markers(display_df['P&L']))
+            st.dataframe(display_df,
+                         use_container_width=True,
+                         hide_index=True,
+                         column_config=HOLDINGS_COLUMN_CONFIG)
+
+        # Top and worst performers
+        if portfolio_summary.get(
+                'top_performer') and portfolio_summary.get(
+                    'worst_performer'):
             col1, col2 = st.columns(2)
 
             with col1:
-                # Sector allocation
-                sector_allocation = portfolio.get_sector_allocation()
-                pie_chart = create_portfolio_pie_chart(sector_allocation)
-
-                if pie_chart:
-                    st.plotly_chart(pie_chart, use_container_width=True)
-                else:
-                    st.info("Sector allocation data not available")
+                top = portfolio_summary['top_performer']
+                st.success(
+                    f"🏆 **Best Performer:** {top['symbol']} (+{top['pnl_percent']:.2f}%)"
+                )
 
             with col2:
-                # Performance history
-                performance_history = portfolio.get_portfolio_performance_history(
+                worst = portfolio_summary['worst_performer']
+                st.error(
+                    f"📉 **Worst Performer:** {worst['symbol']} ({worst['pnl_percent']:.2f}%)"
                 )
-                perf_chart = create_performance_chart(performance_history)
 
-                if perf_chart:
-                    st.plotly_chart(perf_chart, use_container_width=True)
-                else:
-                    st.info("Performance history not available")
-
-            # Holdings performance table
-            st.subheader("📋 Holdings Performance")
+        # Portfolio recommendations
+        st.subheader("💡 AI Recommendations")
 
-            holdings_perf = portfolio_summary.get('holdings_performance', [])
+        with st.spinner("Generating portfolio recommendations..."):
+            recommendations = _recommendations(portfolio, sig)
 
-            if holdings_perf:
-                df_holdings = pd.DataFrame(holdings_perf)
+            if recommendations:
+                if recommendations.get('rebalancing'):
+                    st.warning("⚖️ **Rebalancing Suggestions:**")
+                    for rec in recommendations['rebalancing']:
+                        st.write(
+                            f"• {rec['description']} (Priority: {rec.get('priority', 'Medium')})"
+                        )
 
-                # Format the dataframe for display
-                display_df = df_holdings[[
-                    'symbol', 'quantity', 'buy_price', 'current_price',
-                    'invested_amount', 'current_value', 'pnl', 'pnl_percent'
-                ]].copy()
+                if recommendations.get('reductions'):
+                    st.error("📉 **Consider Reviewing:**")
+                    for rec in recommendations['reductions']:
+                        st.write(f"• {rec['description']}")
 
-                display_df.columns = [
-                    'Symbol', 'Quantity', 'Buy Price', 'Current Price',
-                    'Invested', 'Current Value', 'P&L', 'P&L %'
-                ]
+                if recommendations.get('additions'):
+                    st.info("📈 **Growth Opportunities:**")
+                    for rec in recommendations['additions']:
+                        st.write(
+                            f"• {rec['description']} (Priority: {rec.get('priority', 'Medium')})"
+                        )
+            else:
+                st.info(
+                    "Portfolio recommendations not available at the moment"
+                )
 
-                # Format numbers
-                for col in ['Buy Price', 'Current Price']:
-                    display_df[col] = display_df[col].round(2)
+    else:
+        st.info(
+            "📝 Your portfolio is empty. Add some holdings to get started!")
 
-                for col in ['Invested', 'Current Value', 'P&L']:
-                    display_df[col] = display_df[col].round(2)
+        # Quick add section
+        st.subheader("🚀 Quick Add Holdings")
 
-                display_df['P&L %'] = display_df['P&L %'].round(2)
+        with st.form("quick_add_form"):
+            col1, col2, col3, col4 = st.columns(4)
 
-                # Color coding for P&L
-                def color_pnl(val):
-                    if val > 0:
-                        return 'color: green'
-                    elif val < 0:
-                        return 'color: red'
-                    return ''
+            with col1:
+                symbol = st.text_input("Stock Symbol",
+                                       placeholder="e.g., RELIANCE")
+            with col2:
+                quantity = st.number_input("Quantity",
+                                           min_value=1,
+                                           value=10)
+            with col3:
+                buy_price = st.number_input("Buy Price",
+                                            min_value=0.01,
+                                            value=100.0,
+                                            step=0.01)
+            with col4:
+                buy_date = st.date_input("Buy Date", value=datetime.now())
 
-                styled_df = display_df.style.applymap(color_pnl,
-                                                      subset=['P&L', 'P&L %'])
-                st.dataframe(styled_df,
-                             use_container_width=True,
-                             hide_index=True)
+            submitted = st.form_submit_button("Add to Portfolio",
+                                              use_container_width=True)
 
-            # Top and worst performers
-            if portfolio_summary.get(
-                    'top_performer') and portfolio_summary.get(
-                        'worst_performer'):
-                col1, col2 = st.columns(2)
+            if submitted and symbol:
+                success = portfolio.add_holding(
+                    symbol.upper(), quantity, buy_price,
+                    buy_date.strftime('%Y-%m-%d'))
 
-                with col1:
-                    top = portfolio_summary['top_performer']
+                if success:
                     st.success(
-                        f"🏆 **Best Performer:** {top['symbol']} (+{top['pnl_percent']:.2f}%)"
+                        f"Added {quantity} shares of {symbol.upper()} to portfolio!"
                     )
-
-                with col2:
-                    worst = portfolio_summary['worst_performer']
-                    st.error(
-                        f"📉 **Worst Performer:** {worst['symbol']} ({worst['pnl_percent']:.2f}%)"
-                    )
-
-            # Portfolio recommendations
-            st.subheader("💡 AI Recommendations")
-
-            with st.spinner("Generating portfolio recommendations..."):
-                recommendations = portfolio.get_portfolio_recommendations()
-
-                if recommendations:
-                    if recommendations.get('rebalancing'):
-                        st.warning("⚖️ **Rebalancing Suggestions:**")
-                        for rec in recommendations['rebalancing']:
-                            st.write(
-                                f"• {rec['description']} (Priority: {rec.get('priority', 'Medium')})"
-                            )
-
-                    if recommendations.get('reductions'):
-                        st.error("📉 **Consider Reviewing:**")
-                        for rec in recommendations['reductions']:
-                            st.write(f"• {rec['description']}")
-
-                    if recommendations.get('additions'):
-                        st.info("📈 **Growth Opportunities:**")
-                        for rec in recommendations['additions']:
-                            st.write(
-                                f"• {rec['description']} (Priority: {rec.get('priority', 'Medium')})"
-                            )
+                    st.rerun()
                 else:
-                    st.info(
-                        "Portfolio recommendations not available at the moment"
-                    )
+                    st.error("Failed to add holding. Please try again.")
 
-        else:
-            st.info(
-                "📝 Your portfolio is empty. Add some holdings to get started!")
 
-            # Quick add section
-            st.subheader("🚀 Quick Add Holdings")
+@st.fragment
+def _render_holdings(portfolio, portfolio_summary):
+    """Holdings tab: add, reduce and remove holdings"""
+    st.header("💼 Manage Holdings")
 
-            with st.form("quick_add_form"):
-                col1, col2, col3, col4 = st.columns(4)
+    # Add new holding
+    with st.expander("➕ Add New Holding", expanded=False):
+        with st.form("add_holding_form"):
+            col1, col2 = st.columns(2)
 
-                with col1:
-                    symbol = st.text_input("Stock Symbol",
-                                           placeholder="e.g., RELIANCE")
-                with col2:
-                    quantity = st.number_input("Quantity",
-                                               min_value=1,
-                                               value=10)
-                with col3:
-                    buy_price = st.number_input("Buy Price",
-                                                min_value=0.01,
-                                                value=100.0,
-                                                step=0.01)
-                with col4:
-                    buy_date = st.date_input("Buy Date", value=datetime.now())
+            with col1:
+                symbol = st.text_input("Stock Symbol*",
+                                       placeholder="e.g., RELIANCE")
+                quantity = st.number_input("Quantity*",
+                                           min_value=1,
+                                           value=10)
 
-                submitted = st.form_submit_button("Add to Portfolio",
-                                                  use_container_width=True)
+            with col2:
+                buy_price = st.number_input("Buy Price*",
+                                            min_value=0.01,
+                                            value=100.0,
+                                            step=0.01)
+                buy_date = st.date_input("Buy Date", value=datetime.now())
+
+            submitted = st.form_submit_button("Add Holding")
 
-                if submitted and symbol:
+            if submitted:
+                if symbol and quantity > 0 and buy_price > 0:
                     success = portfolio.add_holding(
                         symbol.upper(), quantity, buy_price,
                         buy_date.strftime('%Y-%m-%d'))
 
                     if success:
                         st.success(
-                            f"Added {quantity} shares of {symbol.upper()} to portfolio!"
+                            f"Successfully added {quantity} shares of {symbol.upper()}!"
                         )
                         st.rerun()
                     else:
-                        st.error("Failed to add holding. Please try again.")
+                        st.error(
+                            "Failed to add holding. Please check your inputs."
+                        )
+                else:
+                    st.error("Please fill all required fields.")
+
+    # Current holdings management
+    if portfolio.holdings:
+        st.subheader("📋 Current Holdings")
+
+        # Prices and P&L already computed by the portfolio summary
+        performance = pd.DataFrame(
+            portfolio_summary.get('holdings_performance', []),
+            columns=['symbol', 'current_price', 'pnl', 'pnl_percent',
+                     'price_available'])
+        performance = performance.drop_duplicates('symbol')
+        performance.loc[~performance['price_available'].astype(bool),
+                        ['current_price', 'pnl', 'pnl_percent']] = np.nan
+
+        df_manage = portfolio.holdings_df.merge(
+            performance.drop(columns='price_available'),
+            on='symbol',
+            how='left')
+        df_manage = df_manage[[
+            'symbol', 'quantity', 'buy_price', 'buy_date', 'current_price',
+            'pnl', 'pnl_percent'
+        ]]
+        df_manage.columns = [
+            'Symbol', 'Quantity', 'Buy Price', 'Buy Date', 'Current Price',
+            'P&L', 'P&L %'
+        ]
+        df_manage['Reduce by'] = 0
+        df_manage['Remove'] = False
+
+        # One editable table instead of an expander per holding; the key
+        # changes with the holdings so applied edits don't linger
+        editor_key = hash(
+            tuple((h['symbol'], h['quantity']) for h in portfolio.holdings))
+
+        with st.form("manage_holdings_form"):
+            edited = st.data_editor(
+                df_manage,
+                use_container_width=True,
+                hide_index=True,
+                column_config=MANAGE_HOLDINGS_COLUMN_CONFIG,
+                disabled=list(df_manage.columns[:-2]),
+                key=f"holdings_editor_{editor_key}")
+            applied = st.form_submit_button("Apply Changes")
+
+        if applied:
+            changes = edited[(edited['Reduce by'] > 0) | edited['Remove']]
+
+            if changes.empty:
+                st.info("No changes to apply.")
+            else:
+                failed = []
+                for symbol, reduce_qty, remove in zip(
+                        changes['Symbol'], changes['Reduce by'],
+                        changes['Remove']):
+                    if remove:
+                        success = portfolio.remove_holding(symbol)
+                    else:
+                        success = portfolio.remove_holding(
+                            symbol, int(reduce_qty))
+                    if not success:
+                        failed.append(symbol)
 
-    with tab2:
-        st.header("💼 Manage Holdings")
+                if failed:
+                    st.error(
+                        f"Failed to update holdings: {', '.join(failed)}")
+                else:
+                    st.success(f"Updated {len(changes)} holding(s)")
+                    st.rerun()
+    else:
+        st.info(
+            "No holdings in portfolio. Add some holdings to get started!")
+
+
+@st.fragment
+def _render_watchlist(portfolio):
+    """Watchlist tab: add, view and remove watched stocks"""
+    st.header("👁️ Watchlist Management")
+
+    # Add to watchlist
+    col1, col2 = st.columns([3, 1])
+
+    with col1:
+        new_symbol = st.text_input(
+            "Add Stock to Watchlist",
+            placeholder="Enter stock symbol (e.g., RELIANCE)")
+
+    with col2:
+        st.write("")  # Empty line for alignment
+        if st.button("Add to Watchlist", use_container_width=True):
+            if new_symbol:
+                success = portfolio.add_to_watchlist(new_symbol.upper())
+                if success:
+                    st.success(f"Added {new_symbol.upper()} to watchlist!")
+                    st.rerun()
+                else:
+                    st.warning(
+                        f"{new_symbol.upper()} is already in watchlist!")
+
+    # Display watchlist
+    if portfolio.watchlist:
+        st.subheader("📋 Your Watchlist")
+
+        watchlist_data = _watchlist_data(portfolio,
+                                         tuple(portfolio.watchlist))
+
+        if watchlist_data:
+            quotes = pd.DataFrame.from_records(
+                watchlist_data,
+                columns=list(_WATCHLIST_DTYPES)).astype(_WATCHLIST_DTYPES)
+
+            # Every watched symbol gets a row, even if its quote failed
+            df_watchlist = pd.DataFrame({
+                'symbol': portfolio.watchlist
+            }).merge(quotes, on='symbol', how='left')
+
+            # Format display
+            display_cols = [
+                'symbol', 'company_name', 'current_price', 'change',
+                'change_percent', 'sector'
+            ]
+            df_display = df_watchlist[display_cols]
+            df_display.columns = [
+                'Symbol', 'Company', 'Price', 'Change', 'Change %',
+                'Sector'
+            ]
+
+            # Gain/loss marker instead of per-cell styling
+            df_display.insert(0, "", _sign_markers(df_display['Change']))
+
+            # Deleting rows in the table removes them from the watchlist
+            st.caption("🗑️ Select rows and press Delete to remove them")
+            edited = st.data_editor(
+                df_display,
+                use_container_width=True,
+                hide_index=True,
+                column_config=WATCHLIST_COLUMN_CONFIG,
+                # Lock the cells but keep row selection and deletion
+                disabled=list(df_display.columns),
+                num_rows="dynamic",
+                key=f"watchlist_editor_{hash(tuple(portfolio.watchlist))}")
+
+            kept = set(edited['Symbol'].dropna())
+            removed = [
+                symbol for symbol in df_display['Symbol']
+                if symbol not in kept
+            ]
+            if removed:
+                for symbol in removed:
+                    portfolio.remove_from_watchlist(symbol)
+                st.success(f"Removed {', '.join(removed)} from watchlist!")
+                st.rerun()
+        else:
+            st.info("Watchlist data temporarily unavailable")
+    else:
+        st.info("Your watchlist is empty. Add some stocks to monitor!")
 
-        # Add new holding
-        with st.expander("➕ Add New Holding", expanded=False):
-            with st.form("add_holding_form"):
-                col1, col2 = st.columns(2)
+
+@st.fragment
+def _render_risk(portfolio, sig):
+    """Risk tab: concentration metrics and AI risk insights"""
+    st.header("⚖️ Risk Analysis")
+
+    if portfolio.holdings:
+        with st.spinner("Analyzing portfolio risk..."):
+            risk_analysis = _risk(portfolio, sig)
+
+            if risk_analysis:
+                # Risk metrics
+                col1, col2, col3 = st.columns(3)
+
+                concentration = risk_analysis.get('concentration_risk', {})
 
                 with col1:
-                    symbol = st.text_input("Stock Symbol*",
-                                           placeholder="e.g., RELIANCE")
-                    quantity = st.number_input("Quantity*",
-                                               min_value=1,
-                                               value=10)
+                    st.metric(
+                        "Top 3 Holdings %",
+                        f"{concentration.get('top_3_holdings_percentage', 0):.1f}%",
+                        help="Percentage of portfolio in top 3 holdings")
 
                 with col2:
-                    buy_price = st.number_input("Buy Price*",
-                                                min_value=0.01,
-                                                value=100.0,
-                                                step=0.01)
-                    buy_date = st.date_input("Buy Date", value=datetime.now())
-
-                submitted = st.form_submit_button("Add Holding")
-
-                if submitted:
-                    if symbol and quantity > 0 and buy_price > 0:
-                        success = portfolio.add_holding(
-                            symbol.upper(), quantity, buy_price,
-                            buy_date.strftime('%Y-%m-%d'))
-
-                        if success:
-                            st.success(
-                                f"Successfully added {quantity} shares of {symbol.upper()}!"
-                            )
-                            st.rerun()
-                        else:
-                            st.error(
-                                "Failed to add holding. Please check your inputs."
-                            )
-                    else:
-                        st.error("Please fill all required fields.")
+                    st.metric(
+                        "Max Sector Allocation",
+                        f"{concentration.get('max_sector_allocation', 0):.1f}%",
+                        help="Highest sector concentration")
 
-        # Current holdings management
-        if portfolio.holdings:
-            st.subheader("📋 Current Holdings")
+                with col3:
+                    st.metric(
+                        "Diversification Score",
+                        f"{risk_analysis.get('diversification_score', 0):.0f}/100",
+                        help="Portfolio diversification rating")
 
-            for i, holding in enumerate(portfolio.holdings):
-                with st.expander(
-                        f"{holding['symbol']} - {holding['quantity']} shares"):
-                    col1, col2, col3 = st.columns(3)
+                # Risk assessment
+                st.subheader("📊 Risk Assessment")
 
-                    with col1:
-                        st.write(f"**Symbol:** {holding['symbol']}")
-                        st.write(f"**Quantity:** {holding['quantity']}")
-                        st.write(f"**Buy Price:** ₹{holding['buy_price']:.2f}")
-                        st.write(f"**Buy Date:** {holding['buy_date']}")
+                # Concentration risk warnings
+                if concentration.get('top_3_holdings_percentage', 0) > 60:
+                    st.error(
+                        "⚠️ **High Concentration Risk**: Top 3 holdings represent more than 60% of portfolio"
+                    )
+                elif concentration.get('top_3_holdings_percentage',
+                                       0) > 40:
+                    st.warning(
+                        "⚠️ **Medium Concentration Risk**: Consider diversifying beyond top holdings"
+                    )
+                else:
+                    st.success(
+                        "✅ **Good Diversification**: Holdings are well distributed"
+                    )
 
-                    with col2:
-                        # Get current price
-                        current_price = get_real_time_price(holding['symbol'])
-                        if current_price:
-                            pnl = (current_price -
-                                   holding['buy_price']) * holding['quantity']
-                            pnl_pct = ((current_price - holding['buy_price']) /
-                                       holding['buy_price']) * 100
-
-                            st.write(
-                                f"**Current Price:** ₹{current_price:.2f}")
-                            st.write(
-                                f"**Current Value:** ₹{current_price * holding['quantity']:,.2f}"
-                            )
+                if concentration.get('max_sector_allocation', 0) > 40:
+                    st.error(
+                        "⚠️ **High Sector Risk**: Over-concentration in single sector"
+                    )
+                elif concentration.get('max_sector_allocation', 0) > 25:
+                    st.warning(
+                        "⚠️ **Medium Sector Risk**: Consider sector diversification"
+                    )
+                else:
+                    st.success(
+                        "✅ **Good Sector Mix**: Well diversified across sectors"
+                    )
 
-                            if pnl >= 0:
-                                st.success(
-                                    f"**P&L:** +₹{pnl:,.2f} (+{pnl_pct:.2f}%)")
-                            else:
-                                st.error(
-                                    f"**P&L:** ₹{pnl:,.2f} ({pnl_pct:.2f}%)")
-                        else:
-                            st.warning("Current price unavailable")
-
-                    with col3:
-                        st.write("**Actions:**")
-
-                        # Reduce quantity
-                        reduce_qty = st.number_input(
-                            f"Reduce quantity",
-                            min_value=1,
-                            max_value=holding['quantity'],
-                            value=1,
-                            key=f"reduce_{i}")
-
-                        col_a, col_b = st.columns(2)
-
-                        with col_a:
-                            if st.button(f"Reduce", key=f"reduce_btn_{i}"):
-                                success = portfolio.remove_holding(
-                                    holding['symbol'], reduce_qty)
-                                if success:
-                                    st.success(f"Reduced {reduce_qty} shares")
-                                    st.rerun()
-                                else:
-                                    st.error("Failed to reduce holding")
-
-                        with col_b:
-                            if st.button(f"Remove All", key=f"remove_btn_{i}"):
-                                success = portfolio.remove_holding(
-                                    holding['symbol'])
-                                if success:
-                                    st.success("Holding removed completely")
-                                    st.rerun()
-                                else:
-                                    st.error("Failed to remove holding")
-        else:
-            st.info(
-                "No holdings in portfolio. Add some holdings to get started!")
+                # AI Risk Analysis
+                ai_analysis = risk_analysis.get('ai_analysis', {})
+                if ai_analysis:
+                    st.subheader("🤖 AI Risk Insights")
 
-    with tab3:
-        st.header("👁️ Watchlist Management")
+                    col1, col2 = st.columns(2)
 
-        # Add to watchlist
-        col1, col2 = st.columns([3, 1])
+                    with col1:
+                        if 'diversification_score' in ai_analysis:
+                            st.metric(
+                                "AI Diversification Score",
+                                f"{ai_analysis['diversification_score']:.1f}/10"
+                            )
 
-        with col1:
-            new_symbol = st.text_input(
-                "Add Stock to Watchlist",
-                placeholder="Enter stock symbol (e.g., RELIANCE)")
+                        if 'risk_rating' in ai_analysis:
+                            st.metric("Risk Rating",
+                                      f"{ai_analysis['risk_rating']}/10")
 
-        with col2:
-            st.write("")  # Empty line for alignment
-            if st.button("Add to Watchlist", use_container_width=True):
-                if new_symbol:
-                    success = portfolio.add_to_watchlist(new_symbol.upper())
-                    if success:
-                        st.success(f"Added {new_symbol.upper()} to watchlist!")
-                        st.rerun()
-                    else:
-                        st.warning(
-                            f"{new_symbol.upper()} is already in watchlist!")
-
-        # Display watchlist
-        if portfolio.watchlist:
-            st.subheader("📋 Your Watchlist")
-
-            watchlist_data = portfolio.get_watchlist_data()
-
-            if watchlist_data:
-                df_watchlist = pd.DataFrame(watchlist_data)
-
-                # Format display
-                display_cols = [
-                    'symbol', 'company_name', 'current_price', 'change',
-                    'change_percent', 'sector'
-                ]
-                df_display = df_watchlist[display_cols].copy()
-                df_display.columns = [
-                    'Symbol', 'Company', 'Price', 'Change', 'Change %',
-                    'Sector'
-                ]
-
-                # Format numbers
-                df_display['Price'] = df_display['Price'].round(2)
-                df_display['Change'] = df_display['Change'].round(2)
-                df_display['Change %'] = df_display['Change %'].round(2)
-
-                # Color coding
-                def color_change(val):
-                    if val > 0:
-                        return 'color: green'
-                    elif val < 0:
-                        return 'color: red'
-                    return ''
-
-                styled_watchlist = df_display.style.applymap(
-                    color_change, subset=['Change', 'Change %'])
-                st.dataframe(styled_watchlist,
-                             use_container_width=True,
-                             hide_index=True)
-
-                # Remove from watchlist
-                st.subheader("🗑️ Remove from Watchlist")
-
-                col1, col2 = st.columns([3, 1])
+                    with col2:
+                        if 'sector_concentration' in ai_analysis:
+                            st.write("**Sector Breakdown:**")
+                            for sector, pct in ai_analysis[
+                                    'sector_concentration'].items():
+                                st.write(f"• {sector}: {pct}%")
+
+                    if 'recommendations' in ai_analysis:
+                        st.subheader("📋 Risk Mitigation Recommendations")
+                        for rec in ai_analysis['recommendations']:
+                            st.info(f"💡 {rec}")
+            else:
+                st.warning("Risk analysis temporarily unavailable")
+    else:
+        st.info("Add holdings to your portfolio to analyze risk")
 
-                with col1:
-                    symbol_to_remove = st.selectbox("Select symbol to remove:",
-                                                    portfolio.watchlist)
 
-                with col2:
-                    st.write("")  # Alignment
-                    if st.button("Remove", use_container_width=True):
-                        success = portfolio.remove_from_watchlist(
-                            symbol_to_remove)
-                        if success:
-                            st.success(
-                                f"Removed {symbol_to_remove} from watchlist!")
-                            st.rerun()
-                        else:
-                            st.error("Failed to remove from watchlist")
-            else:
-                st.info("Watchlist data temporarily unavailable")
-        else:
-            st.info("Your watchlist is empty. Add some stocks to monitor!")
+def main():
+    st.markdown("""
+    <div class="main-header">
+        <h1 style="margin: 0; font-size: 2.5rem;">Portfolio Tracker</h1>
+        <p style="margin: 0.3rem 0 0 0; opacity: 0.9;">Monitor and manage your investment portfolio</p>
+    </div>
+    """,
+                unsafe_allow_html=True)
 
-    with tab4:
-        st.header("⚖️ Risk Analysis")
+    # Initialize portfolio
+    if 'portfolio' not in st.session_state:
+        st.session_state.portfolio = Portfolio()
 
-        if portfolio.holdings:
-            with st.spinner("Analyzing portfolio risk..."):
-                risk_analysis = portfolio.calculate_portfolio_risk()
+    portfolio = st.session_state.portfolio
+    sig = _portfolio_sig(portfolio)
 
-                if risk_analysis:
-                    # Risk metrics
-                    col1, col2, col3 = st.columns(3)
+    # Timestamp only moves when the holdings change or on Refresh
+    if st.session_state.get('last_refresh_sig') != sig:
+        st.session_state.last_refresh_sig = sig
+        st.session_state.last_refresh = datetime.now()
 
-                    concentration = risk_analysis.get('concentration_risk', {})
+    # Shared by the overview tab and the sidebar
+    portfolio_summary = _summary(portfolio, sig)
 
-                    with col1:
-                        st.metric(
-                            "Top 3 Holdings %",
-                            f"{concentration.get('top_3_holdings_percentage', 0):.1f}%",
-                            help="Percentage of portfolio in top 3 holdings")
+    # Tab layout
+    tab1, tab2, tab3, tab4 = st.tabs(
+        ["📈 Overview", "💼 Holdings", "👁️ Watchlist", "⚖️ Risk Analysis"])
 
-                    with col2:
-                        st.metric(
-                            "Max Sector Allocation",
-                            f"{concentration.get('max_sector_allocation', 0):.1f}%",
-                            help="Highest sector concentration")
-
-                    with col3:
-                        st.metric(
-                            "Diversification Score",
-                            f"{risk_analysis.get('diversification_score', 0):.0f}/100",
-                            help="Portfolio diversification rating")
-
-                    # Risk assessment
-                    st.subheader("📊 Risk Assessment")
-
-                    # Concentration risk warnings
-                    if concentration.get('top_3_holdings_percentage', 0) > 60:
-                        st.error(
-                            "⚠️ **High Concentration Risk**: Top 3 holdings represent more than 60% of portfolio"
-                        )
-                    elif concentration.get('top_3_holdings_percentage',
-                                           0) > 40:
-                        st.warning(
-                            "⚠️ **Medium Concentration Risk**: Consider diversifying beyond top holdings"
-                        )
-                    else:
-                        st.success(
-                            "✅ **Good Diversification**: Holdings are well distributed"
-                        )
+    with tab1:
+        _render_overview(portfolio, sig, portfolio_summary)
 
-                    if concentration.get('max_sector_allocation', 0) > 40:
-                        st.error(
-                            "⚠️ **High Sector Risk**: Over-concentration in single sector"
-                        )
-                    elif concentration.get('max_sector_allocation', 0) > 25:
-                        st.warning(
-                            "⚠️ **Medium Sector Risk**: Consider sector diversification"
-                        )
-                    else:
-                        st.success(
-                            "✅ **Good Sector Mix**: Well diversified across sectors"
-                        )
+    with tab2:
+        _render_holdings(portfolio, portfolio_summary)
 
-                    # AI Risk Analysis
-                    ai_analysis = risk_analysis.get('ai_analysis', {})
-                    if ai_analysis:
-                        st.subheader("🤖 AI Risk Insights")
-
-                        col1, col2 = st.columns(2)
-
-                        with col1:
-                            if 'diversification_score' in ai_analysis:
-                                st.metric(
-                                    "AI Diversification Score",
-                                    f"{ai_analysis['diversification_score']:.1f}/10"
-                                )
-
-                            if 'risk_rating' in ai_analysis:
-                                st.metric("Risk Rating",
-                                          f"{ai_analysis['risk_rating']}/10")
-
-                        with col2:
-                            if 'sector_concentration' in ai_analysis:
-                                st.write("**Sector Breakdown:**")
-                                for sector, pct in ai_analysis[
-                                        'sector_concentration'].items():
-                                    st.write(f"• {sector}: {pct}%")
-
-                        if 'recommendations' in ai_analysis:
-                            st.subheader("📋 Risk Mitigation Recommendations")
-                            for rec in ai_analysis['recommendations']:
-                                st.info(f"💡 {rec}")
-                else:
-                    st.warning("Risk analysis temporarily unavailable")
-        else:
-            st.info("Add holdings to your portfolio to analyze risk")
+    with tab3:
+        _render_watchlist(portfolio)
+
+    with tab4:
+        _render_risk(portfolio, sig)
 
     # Sidebar actions
     st.sidebar.header("📊 Portfolio Actions")
 
     # Export portfolio
     if st.sidebar.button("📥 Export Portfolio Data", use_container_width=True):
-        export_data = portfolio.export_portfolio_data()
-
-        if export_data:
-            # Convert to JSON for download
-            import json
-            json_data = json.dumps(export_data, indent=2, default=str)
-
-            st.sidebar.download_button(
-                label="Download JSON",
-                data=json_data,
-                file_name=
-                f"portfolio_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json",
-                mime="application/json")
+        # Reuse the cached tab data rather than recomputing every section
+        export_data = {
+            'portfolio_summary': portfolio_summary,
+            'sector_allocation': _sector_allocation(portfolio, sig),
+            'performance_history': _performance_history(portfolio, sig),
+            'watchlist': _watchlist_data(portfolio,
+                                         tuple(portfolio.watchlist)),
+            'risk_analysis': _risk(portfolio, sig),
+            'recommendations': _recommendations(portfolio, sig),
+            'export_date': datetime.now().isoformat()
+        }
+
+        # Timeline keys are Timestamps, which json cannot use as keys
+        history = export_data['performance_history']
+        for key in ('portfolio_timeline', 'daily_returns'):
+            if key in history:
+                history[key] = {
+                    str(ts): value for ts, value in history[key].items()
+                }
+
+        # Convert to JSON for download
+        json_data = json.dumps(export_data, indent=2, default=str)
+
+        st.sidebar.download_button(
+            label="Download JSON",
+            data=json_data,
+            file_name=
+            f"portfolio_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json",
+            mime="application/json")
 
     # Portfolio summary
-    portfolio_summary = portfolio.get_portfolio_summary()
-
     if portfolio_summary.get('holdings_count', 0) > 0:
-        st.sidebar.metric("Portfolio Value",
-                          f"₹{portfolio_summary['total_value']:,.2f}")
-        st.sidebar.metric("Total P&L",
-                          f"{portfolio_summary['total_pnl_percent']:+.2f}%")
+        summary_text = _summary_strings(
+            *map(portfolio_summary.get, _SUMMARY_TOTALS))
+        st.sidebar.metric("Portfolio Value", summary_text['total_value'])
+        st.sidebar.metric("Total P&L", summary_text['total_pnl_percent'])
 
     # Refresh data
     if st.sidebar.button("🔄 Refresh Data", use_container_width=True):
+        for cached in (_summary, _sector_allocation, _performance_history,
+                       _recommendations, _watchlist_data, _risk):
+            cached.clear()
+        st.session_state.last_refresh = datetime.now()
         st.rerun()
 
     st.sidebar.markdown(
-        f"**Last updated:** {datetime.now().strftime('%H:%M:%S')}")
+        f"**Last updated:** {st.session_state.last_refresh.strftime('%H:%M:%S')}"
+    )
 
 
 if __name__ == "__main__":
@@ -1,8 +1,11 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
 import plotly.graph_objects as go
-import plotly.express as px
-from datetime import datetime, timedelta
+from datetime import date, datetime
+from concurrent.futures import ThreadPoolExecutor
+from streamlit.runtime.scriptrunner import (add_script_run_ctx,
+                                            get_script_run_ctx)
 import sys
 import os
 
@@ -12,84 +15,16 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from utils.ai_analysis import (get_market_sentiment_analysis,
                                analyze_stock_probability,
                                generate_daily_market_summary,
-                               get_ai_stock_recommendations)
+                               get_ai_stock_recommendations,
+                               get_ai_sector_outlook_batch)
 from utils.portfolio import Portfolio
 
 st.set_page_config(page_title="AI Analysis - TRADESENSEI",
                    page_icon="🥋",
                    layout="wide")
 
-
-def create_probability_gauge(probability, title):
-    """Create a probability gauge chart"""
-    fig = go.Figure(
-        go.Indicator(mode="gauge+number+delta",
-                     value=probability * 100,
-                     domain={
-                         'x': [0, 1],
-                         'y': [0, 1]
-                     },
-                     title={'text': title},
-                     delta={'reference': 50},
-                     gauge={
-                         'axis': {
-                             'range': [None, 100]
-                         },
-                         'bar': {
-                             'color': "darkblue"
-                         },
-                         'steps': [{
-                             'range': [0, 25],
-                             'color': "lightgray"
-                         }, {
-                             'range': [25, 50],
-                             'color': "gray"
-                         }, {
-                             'range': [50, 75],
-                             'color': "lightgreen"
-                         }, {
-                             'range': [75, 100],
-                             'color': "green"
-                         }],
-                         'threshold': {
-                             'line': {
-                                 'color': "red",
-                                 'width': 4
-                             },
-                             'thickness': 0.75,
-                             'value': 90
-                         }
-                     }))
-
-    fig.update_layout(height=300)
-    return fig
-
-
-def create_sentiment_chart(sentiment_data):
-    """Create sentiment analysis visualization"""
-    if not sentiment_data:
-        return None
-
-    # Create a simple sentiment indicator
-    sentiment_score = sentiment_data.get('probability', 0.5)
-    sentiment_label = sentiment_data.get('sentiment', 'neutral')
-
-    colors = {'bullish': 'green', 'bearish': 'red', 'neutral': 'gray'}
-    color = colors.get(sentiment_label, 'gray')
-
-    fig = go.Figure(data=go.Bar(x=[sentiment_label.title()],
-                                y=[sentiment_score * 100],
-                                marker_color=color))
-
-    fig.update_layout(title="Market Sentiment Score",
-                      yaxis_title="Confidence %",
-                      height=300)
-
-    return fig
-
-
-# Add luxury styling
-st.markdown("""
+# Luxury styling and page header, sent together as one element per rerun
+_PAGE_CSS = """
 <style>
     .stApp {
         background-color: #EAEOD5;
@@ -131,513 +66,662 @@ st.markdown("""
         color: #EAEOD5;
     }
 </style>
-""",
-            unsafe_allow_html=True)
+"""
+
+_HEADER_HTML = """
+<div class="main-header">
+    <h1 style="margin: 0; font-size: 2.5rem;"> DRAVYUM AI </h1>
+    <p style="margin: 0.3rem 0 0 0; opacity: 0.9;">Advanced artificial intelligence insights for Indian markets</p>
+</div>
+"""
+
+# Static gauge styling shared by every probability gauge; Plotly copies these
+# into the figure, so the module-level dicts are never mutated
+_GAUGE_DOMAIN = {'x': [0, 1], 'y': [0, 1]}
+_GAUGE_DELTA = {'reference': 50}
+_GAUGE = {
+    'axis': {
+        'range': [None, 100]
+    },
+    'bar': {
+        'color': "darkblue"
+    },
+    'steps': [{
+        'range': [0, 25],
+        'color': "lightgray"
+    }, {
+        'range': [25, 50],
+        'color': "gray"
+    }, {
+        'range': [50, 75],
+        'color': "lightgreen"
+    }, {
+        'range': [75, 100],
+        'color': "green"
+    }],
+    'threshold': {
+        'line': {
+            'color': "red",
+            'width': 4
+        },
+        'thickness': 0.75,
+        'value': 90
+    }
+}
 
 
-def main():
-    st.markdown("""
-    <div class="main-header">
-        <h1 style="margin: 0; font-size: 2.5rem;"> DRAVYUM AI </h1>
-        <p style="margin: 0.3rem 0 0 0; opacity: 0.9;">Advanced artificial intelligence insights for Indian markets</p>
-    </div>
-    """,
-                unsafe_allow_html=True)
+def create_probability_gauge(probability, title):
+    """Create a probability gauge chart"""
+    return _build_gauge(round(probability * 100, 1), title)
 
-    # Tab layout
-    tab1, tab2, tab3, tab4 = st.tabs([
-        "📊 Market Sentiment", "🎯 Stock Analysis", "💡 Recommendations",
-        "🔮 Predictions"
-    ])
 
-    with tab1:
-        st.header("📊 Market Sentiment Analysis")
+@st.cache_resource(show_spinner=False, max_entries=128)
+def _build_gauge(value, title):
+    """Gauge figure, built once per displayed value and title"""
+    fig = go.Figure(
+        go.Indicator(mode="gauge+number+delta",
+                     value=value,
+                     domain=_GAUGE_DOMAIN,
+                     title={'text': title},
+                     delta=_GAUGE_DELTA,
+                     gauge=_GAUGE))
 
-        col1, col2 = st.columns([1, 1])
+    fig.update_layout(height=300)
+    return fig
 
-        with col1:
-            if st.button("🔄 Generate Fresh Analysis",
-                         use_container_width=True):
-                with st.spinner("Analyzing market sentiment using AI..."):
-                    try:
-                        sentiment_analysis = get_market_sentiment_analysis()
-                        if sentiment_analysis:
-                            st.session_state.sentiment_data = sentiment_analysis
-                            st.success("Analysis complete!")
-                        else:
-                            st.error("Failed to generate sentiment analysis")
-                    except Exception as e:
-                        st.error(f"Error: {str(e)}")
 
-        with col2:
-            if st.button("📄 Generate Market Summary",
-                         use_container_width=True):
-                with st.spinner("Generating comprehensive market summary..."):
-                    try:
-                        market_summary = generate_daily_market_summary()
-                        if market_summary:
-                            st.session_state.market_summary = market_summary
-                            st.success("Summary generated!")
-                        else:
-                            st.error("Failed to generate market summary")
-                    except Exception as e:
-                        st.error(f"Error: {str(e)}")
-
-        # Display sentiment analysis
-        if hasattr(st.session_state,
-                   'sentiment_data') and st.session_state.sentiment_data:
-            sentiment_data = st.session_state.sentiment_data
-
-            # Key metrics
-            col1, col2, col3, col4 = st.columns(4)
+def create_sentiment_chart(sentiment_data):
+    """Create sentiment analysis visualization"""
+    if not sentiment_data:
+        return None
 
-            with col1:
-                sentiment = sentiment_data.get('sentiment', 'neutral').title()
-                sentiment_emoji = {
-                    'Bullish': '📈',
-                    'Bearish': '📉',
-                    'Neutral': '➡️'
-                }
-                st.metric(
-                    "Market Sentiment",
-                    f"{sentiment_emoji.get(sentiment, '➡️')} {sentiment}",
-                    help="AI-assessed market direction")
+    # Create a simple sentiment indicator
+    sentiment_score = sentiment_data.get('probability', 0.5)
+    sentiment_label = sentiment_data.get('sentiment', 'neutral')
 
-            with col2:
-                probability = sentiment_data.get('probability', 0) * 100
-                st.metric("Confidence Score",
-                          f"{probability:.1f}%",
-                          help="AI confidence in the assessment")
-
-            with col3:
-                direction = sentiment_data.get('direction', 'sideways').title()
-                st.metric("Expected Movement",
-                          direction,
-                          help="Predicted market direction")
-
-            with col4:
-                duration = sentiment_data.get('duration', 'N/A')
-                st.metric("Time Horizon",
-                          duration,
-                          help="Expected duration of trend")
-
-            # Detailed analysis
-            col1, col2 = st.columns(2)
+    colors = {'bullish': 'green', 'bearish': 'red', 'neutral': 'gray'}
+    color = colors.get(sentiment_label, 'gray')
 
-            with col1:
-                # Sentiment gauge
-                prob_gauge = create_probability_gauge(
-                    sentiment_data.get('probability', 0.5),
-                    "Market Sentiment Probability")
-                st.plotly_chart(prob_gauge, use_container_width=True)
+    fig = go.Figure(data=go.Bar(x=[sentiment_label.title()],
+                                y=[sentiment_score * 100],
+                                marker_color=color))
 
-            with col2:
-                # Risk level indicator
-                risk_level = sentiment_data.get('risk_level', 'medium')
-                risk_colors = {
-                    'low': 'green',
-                    'medium': 'orange',
-                    'high': 'red'
-                }
-                risk_color = risk_colors.get(risk_level, 'gray')
-
-                st.markdown("### Risk Assessment")
-                st.markdown(
-                    f"**Risk Level:** :{risk_color}[{risk_level.upper()}]")
-
-                # Key factors
-                key_factors = sentiment_data.get('key_factors', [])
-                if key_factors:
-                    st.markdown("**Key Influencing Factors:**")
-                    for factor in key_factors:
-                        st.write(f"• {factor}")
-
-            # Detailed analysis text
-            st.subheader("🔍 Detailed AI Analysis")
-            analysis_text = sentiment_data.get('analysis',
-                                               'Analysis not available')
-            st.write(analysis_text)
-
-        # Display market summary
-        if hasattr(st.session_state,
-                   'market_summary') and st.session_state.market_summary:
-            st.subheader("📰 AI-Generated Market Summary")
-
-            summary_text = st.session_state.market_summary
-            st.markdown(summary_text)
-
-        # Historical sentiment (simulated for demonstration)
-        st.subheader("📈 Sentiment Trend")
-
-        # Create sample historical sentiment data
-        dates = pd.date_range(start=datetime.now() - timedelta(days=30),
-                              end=datetime.now(),
-                              freq='D')
-        sentiment_scores = [0.3 + 0.4 * (i % 7) / 6 for i in range(len(dates))]
-
-        sentiment_df = pd.DataFrame({
-            'Date': dates,
-            'Sentiment_Score': sentiment_scores
-        })
-
-        fig = px.line(sentiment_df,
-                      x='Date',
-                      y='Sentiment_Score',
-                      title="30-Day Sentiment Trend",
-                      labels={'Sentiment_Score': 'Bullish Sentiment (0-1)'})
-        fig.add_hline(y=0.5,
-                      line_dash="dash",
-                      line_color="gray",
-                      annotation_text="Neutral Line")
-
-        st.plotly_chart(fig, use_container_width=True)
+    fig.update_layout(title="Market Sentiment Score",
+                      yaxis_title="Confidence %",
+                      height=300)
 
-    with tab2:
-        st.header("🎯 Individual Stock Analysis")
+    return fig
 
-        col1, col2 = st.columns([2, 1])
 
-        with col1:
-            symbol_input = st.text_input("Enter Stock Symbol",
-                                         placeholder="e.g., RELIANCE",
-                                         value="RELIANCE")
+@st.cache_data(ttl=300, show_spinner=False)
+def _cached_sentiment():
+    """Market sentiment analysis, reused across reruns for 5 minutes"""
+    return get_market_sentiment_analysis()
 
-        with col2:
-            timeframe = st.selectbox("Analysis Timeframe",
-                                     ["1 week", "2 weeks", "1 month"])
-
-        if st.button("🔍 Analyze Stock", use_container_width=True):
-            if symbol_input:
-                with st.spinner(f"Analyzing {symbol_input} using AI..."):
-                    try:
-                        stock_analysis = analyze_stock_probability(
-                            symbol_input, timeframe)
-                        if stock_analysis:
-                            st.session_state.stock_analysis = stock_analysis
-                            st.success("Stock analysis complete!")
-                        else:
-                            st.error("Failed to analyze stock")
-                    except Exception as e:
-                        st.error(f"Error analyzing stock: {str(e)}")
-
-        # Display stock analysis
-        if hasattr(st.session_state,
-                   'stock_analysis') and st.session_state.stock_analysis:
-            analysis = st.session_state.stock_analysis
 
-            st.subheader(
-                f"📊 Analysis Results: {analysis.get('symbol', 'Unknown')}")
+@st.cache_data(ttl=300, show_spinner=False)
+def _cached_summary():
+    """Daily market summary, reused across reruns for 5 minutes"""
+    return generate_daily_market_summary()
 
-            # Probability metrics
-            col1, col2, col3 = st.columns(3)
 
-            with col1:
-                upward_prob = analysis.get('upward_probability', 0) * 100
-                st.metric("Upward Probability",
-                          f"{upward_prob:.1f}%",
-                          delta="Bullish Signal")
+@st.cache_data(ttl=300, show_spinner=False)
+def _cached_stock(symbol, timeframe):
+    """Stock probability analysis, cached per symbol and timeframe"""
+    return analyze_stock_probability(symbol, timeframe)
 
-            with col2:
-                downward_prob = analysis.get('downward_probability', 0) * 100
-                st.metric("Downward Probability",
-                          f"{downward_prob:.1f}%",
-                          delta="Bearish Signal")
 
-            with col3:
-                confidence = analysis.get('confidence', 0) * 100
-                st.metric("Analysis Confidence", f"{confidence:.1f}%")
+@st.cache_data(ttl=300, show_spinner=False)
+def _cached_recs(criteria_items):
+    """AI stock picks, cached per criteria (passed as sorted key/value pairs)"""
+    return get_ai_stock_recommendations(dict(criteria_items))
 
-            # Price range prediction
-            price_range = analysis.get('expected_price_range', {})
-            if price_range:
-                col1, col2 = st.columns(2)
 
-                with col1:
-                    st.metric("Expected Low",
-                              f"₹{price_range.get('low', 0):.2f}")
+_RESULT_KEYS = ('sentiment_data', 'market_summary', 'stock_analysis',
+                'ai_recommendations', 'nifty_prediction')
 
-                with col2:
-                    st.metric("Expected High",
-                              f"₹{price_range.get('high', 0):.2f}")
+_OUTLOOK_SECTORS = ("Banking", "Technology", "Pharmaceuticals", "Automobiles",
+                    "FMCG")
 
-            # Recommendation
-            recommendation = analysis.get('recommendation', 'hold').upper()
-            rec_colors = {'BUY': 'green', 'SELL': 'red', 'HOLD': 'orange'}
-            rec_color = rec_colors.get(recommendation, 'gray')
 
-            st.markdown(
-                f"### AI Recommendation: :{rec_color}[{recommendation}]")
+@st.cache_data(ttl=900, show_spinner=False)
+def _cached_sector_batch(sectors):
+    """Sector outlook table from one batched analysis call"""
+    outlooks = get_ai_sector_outlook_batch(list(sectors))
+    if not outlooks:
+        return pd.DataFrame()
 
-            # Technical signals
-            signals = analysis.get('technical_signals', [])
-            if signals:
-                st.subheader("📈 Key Technical Signals")
-                for signal in signals:
-                    st.write(f"• {signal}")
+    return pd.DataFrame({
+        'Sector': [o['sector'] for o in outlooks],
+        'Outlook': [o['outlook'] for o in outlooks],
+        'Confidence': [f"{o['confidence']*100:.0f}%" for o in outlooks],
+        'Rating': [o['rating'] for o in outlooks]
+    })
 
-            # Probability visualization
-            col1, col2 = st.columns(2)
 
-            with col1:
-                # Probability pie chart
-                prob_data = {
-                    'Direction': ['Upward', 'Downward'],
-                    'Probability': [
-                        analysis.get('upward_probability', 0),
-                        analysis.get('downward_probability', 0)
-                    ]
-                }
-
-                fig_prob = px.pie(
-                    values=prob_data['Probability'],
-                    names=prob_data['Direction'],
-                    title=f"Price Movement Probabilities - {timeframe}",
-                    color_discrete_map={
-                        'Upward': 'green',
-                        'Downward': 'red'
-                    })
-                st.plotly_chart(fig_prob, use_container_width=True)
+@st.cache_resource(show_spinner=False, max_entries=2)
+def _sentiment_trend_chart(day_key):
+    """Simulated 30-day sentiment trend ending on the given day"""
+    dates = pd.date_range(end=pd.Timestamp(day_key), periods=31, freq='D')
+    sentiment_scores = 0.3 + 0.4 * (np.arange(len(dates)) % 7) / 6
 
-            with col2:
-                # Confidence gauge
-                conf_gauge = create_probability_gauge(
-                    analysis.get('confidence', 0.5), "Analysis Confidence")
-                st.plotly_chart(conf_gauge, use_container_width=True)
+    fig = go.Figure(
+        go.Scattergl(x=dates, y=sentiment_scores, mode='lines'))
+    fig.update_layout(title="30-Day Sentiment Trend",
+                      xaxis_title="Date",
+                      yaxis_title="Bullish Sentiment (0-1)")
+    fig.add_hline(y=0.5,
+                  line_dash="dash",
+                  line_color="gray",
+                  annotation_text="Neutral Line")
+    return fig
 
-    with tab3:
-        st.header("💡 AI Stock Recommendations")
 
-        st.markdown(
-            "Get personalized stock recommendations based on your criteria")
+def _color_outlook(val):
+    """Text colour for a sector outlook cell"""
+    if val == 'Bullish':
+        return 'color: green'
+    elif val == 'Bearish':
+        return 'color: red'
+    return 'color: gray'
 
-        # Recommendation criteria
-        col1, col2 = st.columns(2)
 
-        with col1:
-            st.subheader("📋 Set Your Criteria")
+@st.fragment
+def _render_sentiment():
+    """Market Sentiment tab: AI sentiment, market summary and trend"""
+    st.header("📊 Market Sentiment Analysis")
 
-            market_cap = st.selectbox("Market Cap Preference",
-                                      ["large", "mid", "small", "any"])
-            risk_level = st.selectbox("Risk Tolerance",
-                                      ["low", "medium", "high"])
+    col1, col2, col3 = st.columns([1, 1, 1])
 
-        with col2:
-            sector = st.selectbox("Sector Preference", [
-                "any", "Technology", "Banking", "Pharmaceuticals", "Oil & Gas",
-                "Automobiles", "FMCG"
-            ])
-            time_horizon = st.selectbox(
-                "Investment Horizon",
-                ["short-term", "medium-term", "long-term"])
-
-        if st.button("🎯 Get AI Recommendations", use_container_width=True):
-            criteria = {
-                'market_cap': market_cap,
-                'sector': sector,
-                'risk_level': risk_level,
-                'time_horizon': time_horizon
-            }
+    with col1:
+        if st.button("🔄 Generate Fresh Analysis",
+                     use_container_width=True):
+            with st.spinner("Analyzing market sentiment using AI..."):
+                try:
+                    sentiment_analysis = _cached_sentiment()
+                    if sentiment_analysis:
+                        st.session_state.sentiment_data = sentiment_analysis
+                        st.success("Analysis complete!")
+                    else:
+                        st.error("Failed to generate sentiment analysis")
+                except Exception as e:
+                    st.error(f"Error: {str(e)}")
+
+    with col2:
+        if st.button("📄 Generate Market Summary",
+                     use_container_width=True):
+            with st.spinner("Generating comprehensive market summary..."):
+                try:
+                    market_summary = _cached_summary()
+                    if market_summary:
+                        st.session_state.market_summary = market_summary
+                        st.success("Summary generated!")
+                    else:
+                        st.error("Failed to generate market summary")
+                except Exception as e:
+                    st.error(f"Error: {str(e)}")
 
-            with st.spinner("Generating personalized recommendations..."):
+    with col3:
+        if st.button("⚡ Generate Both", use_container_width=True):
+            with st.spinner("Generating analysis and summary together..."):
                 try:
-                    recommendations = get_ai_stock_recommendations(criteria)
-                    if recommendations:
-                        st.session_state.ai_recommendations = recommendations
-                        st.success("Recommendations generated!")
+                    # Both are independent I/O-bound calls, so overlap them;
+                    # workers carry this run's context for the cached calls
+                    with ThreadPoolExecutor(
+                            max_workers=2,
+                            initializer=add_script_run_ctx,
+                            initargs=(None,
+                                      get_script_run_ctx())) as executor:
+                        sentiment_future = executor.submit(
+                            _cached_sentiment)
+                        summary_future = executor.submit(_cached_summary)
+                        sentiment_analysis = sentiment_future.result()
+                        market_summary = summary_future.result()
+
+                    if sentiment_analysis:
+                        st.session_state.sentiment_data = sentiment_analysis
+                    if market_summary:
+                        st.session_state.market_summary = market_summary
+
+                    if sentiment_analysis and market_summary:
+                        st.success("Analysis and summary complete!")
                     else:
-                        st.error("Failed to generate recommendations")
+                        st.error(
+                            "Failed to generate the analysis or summary")
                 except Exception as e:
                     st.error(f"Error: {str(e)}")
 
-        # Display recommendations
-        if hasattr(
-                st.session_state,
-                'ai_recommendations') and st.session_state.ai_recommendations:
-            recommendations = st.session_state.ai_recommendations
-
-            st.subheader("🎯 AI-Curated Stock Picks")
-
-            for i, rec in enumerate(recommendations):
-                with st.expander(
-                        f"#{i+1} {rec.get('symbol', 'Unknown')} - {rec.get('company_name', 'N/A')}"
-                ):
-                    col1, col2, col3 = st.columns(3)
-
-                    with col1:
-                        st.metric("Target Price",
-                                  f"₹{rec.get('target_price', 0):,.2f}")
-                        st.metric("Upside Potential",
-                                  f"{rec.get('upside_potential', 0):+.1f}%")
-
-                    with col2:
-                        risk_rating = rec.get('risk_rating', 'medium')
-                        risk_emoji = {'low': '🟢', 'medium': '🟡', 'high': '🔴'}
-                        st.write(
-                            f"**Risk Rating:** {risk_emoji.get(risk_rating, '🟡')} {risk_rating.title()}"
-                        )
-
-                        st.write(f"**Symbol:** {rec.get('symbol', 'N/A')}")
-
-                    with col3:
-                        st.write("**Investment Rationale:**")
-                        rationale = rec.get('rationale',
-                                            'Rationale not available')
-                        st.write(rationale)
-
-        # Portfolio-based recommendations
-        st.subheader("📊 Portfolio Enhancement Suggestions")
-
-        if st.button("🔍 Analyze My Portfolio for Recommendations"):
-            portfolio = Portfolio()
-
-            if portfolio.holdings:
-                with st.spinner(
-                        "Analyzing your portfolio for improvement opportunities..."
-                ):
-                    try:
-                        portfolio_recommendations = portfolio.get_portfolio_recommendations(
-                        )
-
-                        if portfolio_recommendations:
-                            st.write("**Based on your current portfolio:**")
-
-                            # Rebalancing suggestions
-                            if portfolio_recommendations.get('rebalancing'):
-                                st.warning("⚖️ **Rebalancing Opportunities:**")
-                                for rec in portfolio_recommendations[
-                                        'rebalancing'][:3]:
-                                    st.write(f"• {rec['description']}")
-
-                            # Addition suggestions
-                            if portfolio_recommendations.get('additions'):
-                                st.info("📈 **Growth Opportunities:**")
-                                for rec in portfolio_recommendations[
-                                        'additions'][:3]:
-                                    st.write(f"• {rec['description']}")
-                        else:
-                            st.info("Your portfolio looks well-balanced!")
-
-                    except Exception as e:
-                        st.error(f"Error analyzing portfolio: {str(e)}")
-            else:
-                st.info(
-                    "Add holdings to your portfolio to get personalized recommendations"
-                )
+    # Display sentiment analysis
+    if sentiment_data := st.session_state.sentiment_data:
 
-    with tab4:
-        st.header("🔮 Market Predictions & Forecasts")
+        # Key metrics
+        col1, col2, col3, col4 = st.columns(4)
+
+        with col1:
+            sentiment = sentiment_data.get('sentiment', 'neutral').title()
+            sentiment_emoji = {
+                'Bullish': '📈',
+                'Bearish': '📉',
+                'Neutral': '➡️'
+            }
+            st.metric(
+                "Market Sentiment",
+                f"{sentiment_emoji.get(sentiment, '➡️')} {sentiment}",
+                help="AI-assessed market direction")
+
+        with col2:
+            probability = sentiment_data.get('probability', 0) * 100
+            st.metric("Confidence Score",
+                      f"{probability:.1f}%",
+                      help="AI confidence in the assessment")
+
+        with col3:
+            direction = sentiment_data.get('direction', 'sideways').title()
+            st.metric("Expected Movement",
+                      direction,
+                      help="Predicted market direction")
+
+        with col4:
+            duration = sentiment_data.get('duration', 'N/A')
+            st.metric("Time Horizon",
+                      duration,
+                      help="Expected duration of trend")
+
+        # Detailed analysis
+        col1, col2 = st.columns(2)
+
+        with col1:
+            # Sentiment gauge
+            prob_gauge = create_probability_gauge(
+                sentiment_data.get('probability', 0.5),
+                "Market Sentiment Probability")
+            st.plotly_chart(prob_gauge, use_container_width=True)
+
+        with col2:
+            # Risk level indicator
+            risk_level = sentiment_data.get('risk_level', 'medium')
+            risk_colors = {
+                'low': 'green',
+                'medium': 'orange',
+                'high': 'red'
+            }
+            risk_color = risk_colors.get(risk_level, 'gray')
+
+            st.markdown("### Risk Assessment")
+            st.markdown(
+                f"**Risk Level:** :{risk_color}[{risk_level.upper()}]")
+
+            # Key factors
+            key_factors = sentiment_data.get('key_factors', [])
+            if key_factors:
+                st.markdown("**Key Influencing Factors:**")
+                for factor in key_factors:
+                    st.write(f"• {factor}")
 
-        st.markdown("Advanced AI predictions for market movements")
+        # Detailed analysis text
+        st.subheader("🔍 Detailed AI Analysis")
+        analysis_text = sentiment_data.get('analysis',
+                                           'Analysis not available')
+        st.write(analysis_text)
 
-        # NIFTY prediction
-        st.subheader("📊 NIFTY 50 Forecast")
+    # Display market summary
+    if summary_text := st.session_state.market_summary:
+        st.subheader("📰 AI-Generated Market Summary")
+        st.markdown(summary_text)
 
-        prediction_timeframe = st.selectbox("Prediction Timeframe",
-                                            ["1 week", "2 weeks", "1 month"])
+    # Historical sentiment (simulated for demonstration)
+    st.subheader("📈 Sentiment Trend")
 
-        if st.button("🔮 Generate NIFTY Prediction"):
-            with st.spinner("Generating NIFTY 50 predictions..."):
+    # Sample historical sentiment, rebuilt once per calendar day
+    fig = _sentiment_trend_chart(date.today().isoformat())
+    st.plotly_chart(fig, use_container_width=True)
+
+
+@st.fragment
+def _render_stock():
+    """Stock Analysis tab: probability analysis for one symbol"""
+    st.header("🎯 Individual Stock Analysis")
+
+    col1, col2 = st.columns([2, 1])
+
+    with col1:
+        symbol_input = st.text_input("Enter Stock Symbol",
+                                     placeholder="e.g., RELIANCE",
+                                     value="RELIANCE")
+
+    with col2:
+        timeframe = st.selectbox("Analysis Timeframe",
+                                 ["1 week", "2 weeks", "1 month"])
+
+    if st.button("🔍 Analyze Stock", use_container_width=True):
+        if symbol_input:
+            with st.spinner(f"Analyzing {symbol_input} using AI..."):
                 try:
-                    nifty_prediction = analyze_stock_probability(
-                        "NIFTY", prediction_timeframe)
-                    if nifty_prediction:
-                        st.session_state.nifty_prediction = nifty_prediction
-                        st.success("Prediction generated!")
+                    stock_analysis = _cached_stock(
+                        symbol_input, timeframe)
+                    if stock_analysis:
+                        st.session_state.stock_analysis = stock_analysis
+                        st.success("Stock analysis complete!")
+                    else:
+                        st.error("Failed to analyze stock")
                 except Exception as e:
-                    st.error(f"Error generating prediction: {str(e)}")
+                    st.error(f"Error analyzing stock: {str(e)}")
+
+    # Display stock analysis
+    if analysis := st.session_state.stock_analysis:
+
+        st.subheader(
+            f"📊 Analysis Results: {analysis.get('symbol', 'Unknown')}")
 
-        # Display NIFTY prediction
-        if hasattr(st.session_state,
-                   'nifty_prediction') and st.session_state.nifty_prediction:
-            pred = st.session_state.nifty_prediction
+        # Probability metrics
+        col1, col2, col3 = st.columns(3)
 
-            col1, col2, col3 = st.columns(3)
+        with col1:
+            upward_prob = analysis.get('upward_probability', 0) * 100
+            st.metric("Upward Probability",
+                      f"{upward_prob:.1f}%",
+                      delta="Bullish Signal")
+
+        with col2:
+            downward_prob = analysis.get('downward_probability', 0) * 100
+            st.metric("Downward Probability",
+                      f"{downward_prob:.1f}%",
+                      delta="Bearish Signal")
+
+        with col3:
+            confidence = analysis.get('confidence', 0) * 100
+            st.metric("Analysis Confidence", f"{confidence:.1f}%")
+
+        # Price range prediction
+        price_range = analysis.get('expected_price_range', {})
+        if price_range:
+            col1, col2 = st.columns(2)
 
             with col1:
-                upward_prob = pred.get('upward_probability', 0) * 100
-                st.metric("Bull Probability", f"{upward_prob:.1f}%")
+                st.metric("Expected Low",
+                          f"₹{price_range.get('low', 0):.2f}")
 
             with col2:
-                downward_prob = pred.get('downward_probability', 0) * 100
-                st.metric("Bear Probability", f"{downward_prob:.1f}%")
+                st.metric("Expected High",
+                          f"₹{price_range.get('high', 0):.2f}")
 
-            with col3:
-                confidence = pred.get('confidence', 0) * 100
-                st.metric("Prediction Confidence", f"{confidence:.1f}%")
+        # Recommendation
+        recommendation = analysis.get('recommendation', 'hold').upper()
+        rec_colors = {'BUY': 'green', 'SELL': 'red', 'HOLD': 'orange'}
+        rec_color = rec_colors.get(recommendation, 'gray')
 
-            # Expected range
-            price_range = pred.get('expected_price_range', {})
-            if price_range:
-                st.subheader(
-                    f"📊 Expected NIFTY Range ({prediction_timeframe})")
-                col1, col2 = st.columns(2)
+        st.markdown(
+            f"### AI Recommendation: :{rec_color}[{recommendation}]")
 
-                with col1:
-                    st.metric("Expected Low",
-                              f"{price_range.get('low', 0):,.0f}")
-                with col2:
-                    st.metric("Expected High",
-                              f"{price_range.get('high', 0):,.0f}")
-
-        # Sector predictions
-        st.subheader("🏭 Sector Outlook")
-
-        sectors = [
-            "Banking", "Technology", "Pharmaceuticals", "Automobiles", "FMCG"
-        ]
-
-        # Create sample sector predictions (in production, this would use real AI)
-        sector_predictions = []
-        for sector in sectors:
-            # Simulate predictions
-            import random
-            outlook = random.choice(["Bullish", "Bearish", "Neutral"])
-            confidence = random.uniform(0.6, 0.9)
-
-            sector_predictions.append({
-                'Sector':
-                sector,
-                'Outlook':
-                outlook,
-                'Confidence':
-                f"{confidence*100:.0f}%",
-                'Rating':
-                random.choice(["Buy", "Hold", "Sell"])
-            })
-
-        df_sectors = pd.DataFrame(sector_predictions)
-
-        # Color coding
-        def color_outlook(val):
-            if val == 'Bullish':
-                return 'color: green'
-            elif val == 'Bearish':
-                return 'color: red'
-            return 'color: gray'
-
-        styled_sectors = df_sectors.style.applymap(color_outlook,
-                                                   subset=['Outlook'])
-        st.dataframe(styled_sectors, use_container_width=True, hide_index=True)
-
-        # Market timing analysis
-        st.subheader("⏰ Market Timing Analysis")
+        # Technical signals
+        signals = analysis.get('technical_signals', [])
+        if signals:
+            st.subheader("📈 Key Technical Signals")
+            for signal in signals:
+                st.write(f"• {signal}")
 
+        # Probability visualization
         col1, col2 = st.columns(2)
 
         with col1:
-            st.info("📈 **Optimal Entry Points:**")
-            st.write(
-                "• Market corrections of 2-3% provide good entry opportunities"
+            # Probability bars
+            fig_prob = go.Figure(
+                go.Bar(x=['Upward', 'Downward'],
+                       y=[
+                           analysis.get('upward_probability', 0),
+                           analysis.get('downward_probability', 0)
+                       ],
+                       marker_color=['green', 'red']))
+            fig_prob.update_layout(
+                title=f"Price Movement Probabilities - {timeframe}",
+                yaxis_title="Probability")
+            st.plotly_chart(fig_prob, use_container_width=True)
+
+        with col2:
+            # Confidence gauge
+            conf_gauge = create_probability_gauge(
+                analysis.get('confidence', 0.5), "Analysis Confidence")
+            st.plotly_chart(conf_gauge, use_container_width=True)
+
+
+@st.fragment
+def _render_recommendations():
+    """Recommendations tab: AI stock picks and portfolio suggestions"""
+    st.header("💡 AI Stock Recommendations")
+
+    st.markdown(
+        "Get personalized stock recommendations based on your criteria")
+
+    # Recommendation criteria
+    col1, col2 = st.columns(2)
+
+    with col1:
+        st.subheader("📋 Set Your Criteria")
+
+        market_cap = st.selectbox("Market Cap Preference",
+                                  ["large", "mid", "small", "any"])
+        risk_level = st.selectbox("Risk Tolerance",
+                                  ["low", "medium", "high"])
+
+    with col2:
+        sector = st.selectbox("Sector Preference", [
+            "any", "Technology", "Banking", "Pharmaceuticals", "Oil & Gas",
+            "Automobiles", "FMCG"
+        ])
+        time_horizon = st.selectbox(
+            "Investment Horizon",
+            ["short-term", "medium-term", "long-term"])
+
+    if st.button("🎯 Get AI Recommendations", use_container_width=True):
+        criteria = {
+            'market_cap': market_cap,
+            'sector': sector,
+            'risk_level': risk_level,
+            'time_horizon': time_horizon
+        }
+
+        with st.spinner("Generating personalized recommendations..."):
+            try:
+                recommendations = _cached_recs(
+                    tuple(sorted(criteria.items())))
+                if recommendations:
+                    st.session_state.ai_recommendations = recommendations
+                    st.success("Recommendations generated!")
+                else:
+                    st.error("Failed to generate recommendations")
+            except Exception as e:
+                st.error(f"Error: {str(e)}")
+
+    # Display recommendations
+    if recommendations := st.session_state.ai_recommendations:
+
+        st.subheader("🎯 AI-Curated Stock Picks")
+
+        for i, rec in enumerate(recommendations):
+            with st.expander(
+                    f"#{i+1} {rec.get('symbol', 'Unknown')} - {rec.get('company_name', 'N/A')}"
+            ):
+                col1, col2, col3 = st.columns(3)
+
+                with col1:
+                    st.metric("Target Price",
+                              f"₹{rec.get('target_price', 0):,.2f}")
+                    st.metric("Upside Potential",
+                              f"{rec.get('upside_potential', 0):+.1f}%")
+
+                with col2:
+                    risk_rating = rec.get('risk_rating', 'medium')
+                    risk_emoji = {'low': '🟢', 'medium': '🟡', 'high': '🔴'}
+                    st.write(
+                        f"**Risk Rating:** {risk_emoji.get(risk_rating, '🟡')} {risk_rating.title()}"
+                    )
+
+                    st.write(f"**Symbol:** {rec.get('symbol', 'N/A')}")
+
+                with col3:
+                    st.write("**Investment Rationale:**")
+                    rationale = rec.get('rationale',
+                                        'Rationale not available')
+                    st.write(rationale)
+
+    # Portfolio-based recommendations
+    st.subheader("📊 Portfolio Enhancement Suggestions")
+
+    if st.button("🔍 Analyze My Portfolio for Recommendations"):
+        # Same instance the Portfolio Tracker edits, loaded once per session
+        if 'portfolio' not in st.session_state:
+            st.session_state.portfolio = Portfolio()
+        portfolio = st.session_state.portfolio
+
+        if portfolio.holdings:
+            with st.spinner(
+                    "Analyzing your portfolio for improvement opportunities..."
+            ):
+                try:
+                    portfolio_recommendations = portfolio.get_portfolio_recommendations(
+                    )
+
+                    if portfolio_recommendations:
+                        st.write("**Based on your current portfolio:**")
+
+                        # Rebalancing suggestions
+                        if portfolio_recommendations.get('rebalancing'):
+                            st.warning("⚖️ **Rebalancing Opportunities:**")
+                            for rec in portfolio_recommendations[
+                                    'rebalancing'][:3]:
+                                st.write(f"• {rec['description']}")
+
+                        # Addition suggestions
+                        if portfolio_recommendations.get('additions'):
+                            st.info("📈 **Growth Opportunities:**")
+                            for rec in portfolio_recommendations[
+                                    'additions'][:3]:
+                                st.write(f"• {rec['description']}")
+                    else:
+                        st.info("Your portfolio looks well-balanced!")
+
+                except Exception as e:
+                    st.error(f"Error analyzing portfolio: {str(e)}")
+        else:
+            st.info(
+                "Add holdings to your portfolio to get personalized recommendations"
             )
-            st.write("• Mid-month periods typically show lower volatility")
-            st.write(
-                "• Post-earnings season often presents value opportunities")
+
+
+@st.fragment
+def _render_predictions():
+    """Predictions tab: NIFTY forecast, sector outlook and timing"""
+    st.header("🔮 Market Predictions & Forecasts")
+
+    st.markdown("Advanced AI predictions for market movements")
+
+    # NIFTY prediction
+    st.subheader("📊 NIFTY 50 Forecast")
+
+    prediction_timeframe = st.selectbox("Prediction Timeframe",
+                                        ["1 week", "2 weeks", "1 month"])
+
+    if st.button("🔮 Generate NIFTY Prediction"):
+        with st.spinner("Generating NIFTY 50 predictions..."):
+            try:
+                nifty_prediction = _cached_stock(
+                    "NIFTY", prediction_timeframe)
+                if nifty_prediction:
+                    st.session_state.nifty_prediction = nifty_prediction
+                    st.success("Prediction generated!")
+            except Exception as e:
+                st.error(f"Error generating prediction: {str(e)}")
+
+    # Display NIFTY prediction
+    if pred := st.session_state.nifty_prediction:
+
+        col1, col2, col3 = st.columns(3)
+
+        with col1:
+            upward_prob = pred.get('upward_probability', 0) * 100
+            st.metric("Bull Probability", f"{upward_prob:.1f}%")
 
         with col2:
-            st.warning("⚠️ **Risk Periods:**")
-            st.write("• First week of month typically shows higher volatility")
-            st.write("• Global event impacts can cause temporary disruptions")
-            st.write("• End of quarter profit booking may increase volatility")
+            downward_prob = pred.get('downward_probability', 0) * 100
+            st.metric("Bear Probability", f"{downward_prob:.1f}%")
+
+        with col3:
+            confidence = pred.get('confidence', 0) * 100
+            st.metric("Prediction Confidence", f"{confidence:.1f}%")
+
+        # Expected range
+        price_range = pred.get('expected_price_range', {})
+        if price_range:
+            st.subheader(
+                f"📊 Expected NIFTY Range ({prediction_timeframe})")
+            col1, col2 = st.columns(2)
+
+            with col1:
+                st.metric("Expected Low",
+                          f"{price_range.get('low', 0):,.0f}")
+            with col2:
+                st.metric("Expected High",
+                          f"{price_range.get('high', 0):,.0f}")
+
+    # Sector predictions
+    st.subheader("🏭 Sector Outlook")
+
+    df_sectors = _cached_sector_batch(_OUTLOOK_SECTORS)
+
+    if not df_sectors.empty:
+        styled_sectors = df_sectors.style.map(_color_outlook,
+                                              subset=['Outlook'])
+        st.dataframe(styled_sectors,
+                     use_container_width=True,
+                     hide_index=True)
+    else:
+        st.info("Sector outlook not available")
+
+    # Market timing analysis
+    st.subheader("⏰ Market Timing Analysis")
+
+    col1, col2 = st.columns(2)
+
+    with col1:
+        st.info("📈 **Optimal Entry Points:**")
+        st.write(
+            "• Market corrections of 2-3% provide good entry opportunities"
+        )
+        st.write("• Mid-month periods typically show lower volatility")
+        st.write(
+            "• Post-earnings season often presents value opportunities")
+
+    with col2:
+        st.warning("⚠️ **Risk Periods:**")
+        st.write("• First week of month typically shows higher volatility")
+        st.write("• Global event impacts can cause temporary disruptions")
+        st.write("• End of quarter profit booking may increase volatility")
+
+
+def main():
+    st.markdown(_PAGE_CSS + _HEADER_HTML, unsafe_allow_html=True)
+
+    # AI results shown by the tabs, set once so later checks are plain reads
+    for key in _RESULT_KEYS:
+        st.session_state.setdefault(key, None)
+
+    # Tab layout
+    tab1, tab2, tab3, tab4 = st.tabs([
+        "📊 Market Sentiment", "🎯 Stock Analysis", "💡 Recommendations",
+        "🔮 Predictions"
+    ])
+
+    with tab1:
+        _render_sentiment()
+
+    with tab2:
+        _render_stock()
+
+    with tab3:
+        _render_recommendations()
+
+    with tab4:
+        _render_predictions()
 
     # Sidebar information
     st.sidebar.header("🤖 AI Analysis Info")
@@ -663,6 +747,13 @@ def main():
     st.sidebar.success("🟢 AI Engine: Online")
     st.sidebar.success("🟢 Market Data: Live")
 
+    # Cached AI results expire after 5 minutes; this drops them right away
+    if st.sidebar.button("🔄 Force Refresh", use_container_width=True):
+        for cached in (_cached_sentiment, _cached_summary, _cached_stock,
+                       _cached_recs, _cached_sector_batch):
+            cached.clear()
+        st.sidebar.success("AI caches cleared - the next analysis will be fresh")
+
     st.sidebar.markdown(
         f"**Last updated:** {datetime.now().strftime('%H:%M:%S')}")
 
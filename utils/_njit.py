@@ -0,0 +1,8 @@
+try:
+    from numba import njit
+except ImportError:  # numba is optional; kernels fall back to plain Python
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit when numba is not installed"""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
@@ -7,7 +7,7 @@ from datetime import datetime, timedelta
 from sklearn.linear_model import LinearRegression
 from sklearn.preprocessing import StandardScaler
 import requests
-from .market_data import get_nifty_data, get_stock_data, get_top_gainers_losers
+from .market_data import get_nifty_data, get_stock_data, get_top_gainers_losers, get_batch_closes
 
 def get_market_sentiment_analysis() -> Optional[Dict]:
     """
@@ -429,6 +429,66 @@ def analyze_portfolio_risk(portfolio: List[Dict]) -> Optional[Dict]:
         print(f"Error in portfolio risk analysis: {e}")
         return None
 
+SECTOR_INDICES = {
+    'Banking': '^NSEBANK',
+    'Technology': '^CNXIT',
+    'Pharmaceuticals': '^CNXPHARMA',
+    'Automobiles': '^CNXAUTO',
+    'FMCG': '^CNXFMCG'
+}
+
+def get_ai_sector_outlook_batch(sectors: List[str]) -> Optional[List[Dict]]:
+    """
+    Outlook for several sectors from one batched download of their NSE indices
+    Statistical trend and volatility scoring, same approach as the stock analysis
+    """
+    try:
+        symbols = {sector: SECTOR_INDICES[sector] for sector in sectors if sector in SECTOR_INDICES}
+        if not symbols:
+            return None
+        
+        closes = get_batch_closes(list(symbols.values()), period="3mo")
+        if closes.empty:
+            return None
+        
+        outlooks = []
+        for sector, symbol in symbols.items():
+            if symbol not in closes.columns:
+                continue
+            close = closes[symbol].dropna()
+            if len(close) < 50:
+                continue
+            
+            current_price = close.iloc[-1]
+            sma_20 = close.iloc[-20:].mean()
+            sma_50 = close.iloc[-50:].mean()
+            momentum = (current_price - sma_20) / sma_20 * 100
+            
+            # Trend from price against its moving averages
+            if current_price > sma_20 > sma_50:
+                outlook, rating = "Bullish", "Buy"
+            elif current_price < sma_20 < sma_50:
+                outlook, rating = "Bearish", "Sell"
+            else:
+                outlook, rating = "Neutral", "Hold"
+            
+            # Confidence falls as volatility rises, boosted by strong momentum
+            volatility = close.pct_change().std() * np.sqrt(252) * 100
+            confidence = max(0.3, min(0.9, 1 - volatility / 50 + min(abs(momentum), 5) / 50))
+            
+            outlooks.append({
+                'sector': sector,
+                'outlook': outlook,
+                'confidence': round(confidence, 2),
+                'rating': rating
+            })
+        
+        return outlooks if outlooks else None
+        
+    except Exception as e:
+        print(f"Error getting sector outlook: {e}")
+        return None
+
 def get_ai_stock_recommendations(criteria: Dict) -> Optional[List[Dict]]:
     """
     Get stock recommendations based on criteria using rule-based system
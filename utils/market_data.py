@@ -4,16 +4,58 @@ import numpy as np
 from datetime import datetime, timedelta
 import requests
 import json
+import os
 from typing import Tuple, Optional
+from ._njit import njit
+
+HISTORY_CACHE_DIR = os.path.join("data", "cache")
+INTRADAY_CACHE_TTL = 60  # seconds while the market is open
+
+def _history_cache_valid(cache_path: str) -> bool:
+    """
+    Check whether a cached history file is still fresh
+    While the market is open files live for a minute; once it closes they stay
+    valid as long as they were written after the most recent 3:30 PM close
+    """
+    if not os.path.exists(cache_path):
+        return False
+    
+    written = datetime.fromtimestamp(os.path.getmtime(cache_path))
+    now = datetime.now()
+    if get_market_status().get('is_open', False):
+        return (now - written).total_seconds() < INTRADAY_CACHE_TTL
+    
+    last_close = now.replace(hour=15, minute=30, second=0, microsecond=0)
+    if now < last_close:
+        last_close -= timedelta(days=1)
+    return written >= last_close
+
+def _cached_history(symbol: str, period: str) -> pd.DataFrame:
+    """
+    Fetch price history through an on-disk parquet cache shared across sessions
+    """
+    cache_path = os.path.join(HISTORY_CACHE_DIR, f"{symbol}_{period}.parquet")
+    try:
+        if _history_cache_valid(cache_path):
+            return pd.read_parquet(cache_path)
+    except Exception:
+        pass
+    
+    data = yf.Ticker(symbol).history(period=period)
+    if not data.empty:
+        try:
+            os.makedirs(HISTORY_CACHE_DIR, exist_ok=True)
+            data.to_parquet(cache_path)
+        except Exception:
+            pass
+    return data
 
 def get_nifty_data(period: str = "1mo") -> pd.DataFrame:
     """
     Fetch NIFTY 50 historical data
     """
     try:
-        nifty = yf.Ticker("^NSEI")
-        data = nifty.history(period=period)
-        return data
+        return _cached_history("^NSEI", period)
     except Exception as e:
         print(f"Error fetching NIFTY data: {e}")
         return pd.DataFrame()
@@ -27,9 +69,7 @@ def get_stock_data(symbol: str, period: str = "1mo") -> pd.DataFrame:
         if not symbol.endswith('.NS') and not symbol.startswith('^'):
             symbol = f"{symbol}.NS"
         
-        stock = yf.Ticker(symbol)
-        data = stock.history(period=period)
-        return data
+        return _cached_history(symbol, period)
     except Exception as e:
         print(f"Error fetching stock data for {symbol}: {e}")
         return pd.DataFrame()
@@ -45,6 +85,23 @@ def get_multiple_stocks_data(symbols: list, period: str = "1mo") -> dict:
             stocks_data[symbol] = data
     return stocks_data
 
+def get_batch_closes(symbols: list, period: str = "3mo") -> pd.DataFrame:
+    """
+    Fetch closing prices for several symbols in a single batched download
+    Returns one column per symbol that came back with data
+    """
+    try:
+        batch = yf.download(list(symbols), period=period, group_by='ticker',
+                            threads=True, progress=False)
+        if batch.empty:
+            return pd.DataFrame()
+        
+        closes = batch.xs('Close', level=1, axis=1)
+        return closes.dropna(axis=1, how='all')
+    except Exception as e:
+        print(f"Error fetching batch closes: {e}")
+        return pd.DataFrame()
+
 def get_top_gainers_losers() -> Tuple[pd.DataFrame, pd.DataFrame]:
     """
     Get top gainers and losers from NSE
@@ -115,16 +172,70 @@ def get_real_time_price(symbol: str) -> Optional[float]:
         print(f"Error fetching real-time price for {symbol}: {e}")
         return None
 
+@njit(cache=True)
+def _rolling_mean(values, window, out):
+    """
+    Trailing simple moving average via a running sum (NaN while the window holds a NaN)
+    """
+    total = 0.0
+    nans = 0
+    for i in range(len(values)):
+        if np.isnan(values[i]):
+            nans += 1
+        else:
+            total += values[i]
+        if i >= window:
+            if np.isnan(values[i - window]):
+                nans -= 1
+            else:
+                total -= values[i - window]
+        if i >= window - 1 and nans == 0:
+            out[i] = total / window
+        else:
+            out[i] = np.nan
+
+@njit(cache=True)
+def _wilder_rsi(close, period, out):
+    """
+    RSI with Wilder smoothing, seeded by the simple average of the first period changes
+    """
+    out[:] = np.nan
+    if len(close) <= period:
+        return
+    avg_gain = 0.0
+    avg_loss = 0.0
+    for i in range(1, len(close)):
+        delta = close[i] - close[i - 1]
+        gain = delta if delta > 0 else 0.0
+        loss = -delta if delta < 0 else 0.0
+        if i <= period:
+            avg_gain += gain / period
+            avg_loss += loss / period
+            if i < period:
+                continue
+        else:
+            avg_gain = (avg_gain * (period - 1) + gain) / period
+            avg_loss = (avg_loss * (period - 1) + loss) / period
+        if avg_loss == 0:
+            out[i] = 100.0 if avg_gain > 0 else 50.0
+        else:
+            out[i] = 100 - 100 / (1 + avg_gain / avg_loss)
+
 def calculate_technical_indicators(data: pd.DataFrame) -> pd.DataFrame:
     """
     Calculate common technical indicators
     """
     try:
         df = data.copy()
+        close = df['Close'].to_numpy(dtype=np.float64)
         
         # Moving averages
-        df['SMA_20'] = df['Close'].rolling(window=20).mean()
-        df['SMA_50'] = df['Close'].rolling(window=50).mean()
+        sma_20 = np.empty(len(close))
+        sma_50 = np.empty(len(close))
+        _rolling_mean(close, 20, sma_20)
+        _rolling_mean(close, 50, sma_50)
+        df['SMA_20'] = sma_20
+        df['SMA_50'] = sma_50
         df['EMA_12'] = df['Close'].ewm(span=12).mean()
         df['EMA_26'] = df['Close'].ewm(span=26).mean()
         
@@ -132,15 +243,13 @@ def calculate_technical_indicators(data: pd.DataFrame) -> pd.DataFrame:
         df['MACD'] = df['EMA_12'] - df['EMA_26']
         df['MACD_Signal'] = df['MACD'].ewm(span=9).mean()
         
-        # RSI
-        delta = df['Close'].diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
-        rs = gain / loss
-        df['RSI'] = 100 - (100 / (1 + rs))
+        # RSI (Wilder)
+        rsi = np.empty(len(close))
+        _wilder_rsi(close, 14, rsi)
+        df['RSI'] = rsi
         
         # Bollinger Bands
-        df['BB_Middle'] = df['Close'].rolling(window=20).mean()
+        df['BB_Middle'] = sma_20
         bb_std = df['Close'].rolling(window=20).std()
         df['BB_Upper'] = df['BB_Middle'] + (bb_std * 2)
         df['BB_Lower'] = df['BB_Middle'] - (bb_std * 2)
@@ -4,9 +4,35 @@ from typing import Dict, List, Optional, Tuple
 from datetime import datetime, timedelta
 import json
 import os
+from concurrent.futures import ThreadPoolExecutor
 from .market_data import get_stock_data, get_real_time_price
 from .fundamentals import get_fundamental_data
 from .ai_analysis import analyze_portfolio_risk
+from ._njit import njit
+
+HOLDING_COLUMNS = ['symbol', 'quantity', 'buy_price', 'buy_date']
+
+@njit(cache=True)
+def _summarize(quantity, buy_price, current_price, invested, value, pnl, pnl_percent):
+    """
+    Per-holding P&L plus portfolio totals and best/worst holding indices in one pass
+    """
+    total_value = 0.0
+    total_invested = 0.0
+    best = 0
+    worst = 0
+    for i in range(len(quantity)):
+        invested[i] = quantity[i] * buy_price[i]
+        value[i] = quantity[i] * current_price[i]
+        pnl[i] = value[i] - invested[i]
+        pnl_percent[i] = pnl[i] * 100 / invested[i] if invested[i] > 0 else 0.0
+        total_value += value[i]
+        total_invested += invested[i]
+        if pnl_percent[i] > pnl_percent[best]:
+            best = i
+        if pnl_percent[i] < pnl_percent[worst]:
+            worst = i
+    return total_value, total_invested, best, worst
 
 class Portfolio:
     def __init__(self, portfolio_file: str = "portfolio.json"):
@@ -14,6 +40,11 @@ class Portfolio:
         self.holdings = self._load_portfolio()
         self.watchlist = self._load_watchlist()
     
+    @property
+    def holdings_df(self) -> pd.DataFrame:
+        """Holdings as a columnar DataFrame, one row per holding"""
+        return pd.DataFrame.from_records(self.holdings, columns=HOLDING_COLUMNS)
+    
     def _load_portfolio(self) -> List[Dict]:
         """Load portfolio from JSON file"""
         try:
@@ -147,49 +178,44 @@ class Portfolio:
                     'worst_performer': None
                 }
             
-            total_value = 0
-            total_invested = 0
-            holdings_performance = []
+            holdings = self.holdings_df
+            quantity = holdings['quantity'].to_numpy(dtype=np.float64)
+            buy_price = holdings['buy_price'].to_numpy(dtype=np.float64)
+            
+            # Get current prices concurrently, falling back to buy price when unavailable
+            symbols = holdings['symbol'].tolist()
+            with ThreadPoolExecutor(max_workers=min(16, len(symbols))) as executor:
+                live_price = pd.Series(
+                    list(executor.map(get_real_time_price, symbols)), dtype='float64'
+                ).to_numpy()
+            price_available = ~np.isnan(live_price)
+            current_price = np.where(price_available, live_price, buy_price)
+            
+            # Calculate metrics for all holdings in a single pass
+            invested_amount = np.empty_like(quantity)
+            current_value = np.empty_like(quantity)
+            pnl = np.empty_like(quantity)
+            pnl_percent = np.empty_like(quantity)
+            total_value, total_invested, best, worst = _summarize(
+                quantity, buy_price, current_price,
+                invested_amount, current_value, pnl, pnl_percent
+            )
             
-            for holding in self.holdings:
-                symbol = holding['symbol']
-                quantity = holding['quantity']
-                buy_price = holding['buy_price']
-                
-                # Get current price
-                current_price = get_real_time_price(symbol)
-                if current_price is None:
-                    current_price = buy_price  # Fallback to buy price
-                
-                # Calculate metrics
-                invested_amount = quantity * buy_price
-                current_value = quantity * current_price
-                pnl = current_value - invested_amount
-                pnl_percent = (pnl / invested_amount) * 100 if invested_amount > 0 else 0
-                
-                total_value += current_value
-                total_invested += invested_amount
-                
-                holdings_performance.append({
-                    'symbol': symbol,
-                    'quantity': quantity,
-                    'buy_price': buy_price,
-                    'current_price': current_price,
-                    'invested_amount': invested_amount,
-                    'current_value': current_value,
-                    'pnl': pnl,
-                    'pnl_percent': pnl_percent
-                })
+            holdings_performance = holdings[['symbol', 'quantity', 'buy_price']].assign(
+                current_price=current_price,
+                price_available=price_available,
+                invested_amount=invested_amount,
+                current_value=current_value,
+                pnl=pnl,
+                pnl_percent=pnl_percent
+            ).to_dict('records')
             
             total_pnl = total_value - total_invested
             total_pnl_percent = (total_pnl / total_invested) * 100 if total_invested > 0 else 0
             
             # Find top and worst performers
-            if holdings_performance:
-                top_performer = max(holdings_performance, key=lambda x: x['pnl_percent'])
-                worst_performer = min(holdings_performance, key=lambda x: x['pnl_percent'])
-            else:
-                top_performer = worst_performer = None
+            top_performer = holdings_performance[best]
+            worst_performer = holdings_performance[worst]
             
             return {
                 'total_value': total_value,
@@ -298,37 +324,51 @@ class Portfolio:
             print(f"Error getting portfolio performance history: {e}")
             return {}
     
+    def _watchlist_quote(self, symbol: str) -> Optional[Dict]:
+        """Get quote, daily change and basic info for one watchlist stock"""
+        try:
+            current_price = get_real_time_price(symbol)
+            if not current_price:
+                return None
+            
+            # Get basic stock data
+            stock_data = get_stock_data(symbol, period="5d")
+            if stock_data.empty:
+                return None
+            
+            prev_price = stock_data['Close'].iloc[-2] if len(stock_data) > 1 else current_price
+            change = current_price - prev_price
+            change_percent = (change / prev_price) * 100 if prev_price > 0 else 0
+            
+            # Get fundamental data
+            fundamental = get_fundamental_data(symbol)
+            basic_info = fundamental.get('basic_info', {})
+            
+            return {
+                'symbol': symbol,
+                'company_name': basic_info.get('company_name', 'N/A'),
+                'current_price': current_price,
+                'change': change,
+                'change_percent': change_percent,
+                'sector': basic_info.get('sector', 'N/A'),
+                'market_cap': basic_info.get('market_cap', 0)
+            }
+            
+        except Exception as e:
+            print(f"Error getting watchlist data for {symbol}: {e}")
+            return None
+    
     def get_watchlist_data(self) -> List[Dict]:
         """Get current data for watchlist stocks"""
         try:
-            watchlist_data = []
+            if not self.watchlist:
+                return []
             
-            for symbol in self.watchlist:
-                current_price = get_real_time_price(symbol)
-                if current_price:
-                    # Get basic stock data
-                    stock_data = get_stock_data(symbol, period="5d")
-                    
-                    if not stock_data.empty:
-                        prev_price = stock_data['Close'].iloc[-2] if len(stock_data) > 1 else current_price
-                        change = current_price - prev_price
-                        change_percent = (change / prev_price) * 100 if prev_price > 0 else 0
-                        
-                        # Get fundamental data
-                        fundamental = get_fundamental_data(symbol)
-                        basic_info = fundamental.get('basic_info', {})
-                        
-                        watchlist_data.append({
-                            'symbol': symbol,
-                            'company_name': basic_info.get('company_name', 'N/A'),
-                            'current_price': current_price,
-                            'change': change,
-                            'change_percent': change_percent,
-                            'sector': basic_info.get('sector', 'N/A'),
-                            'market_cap': basic_info.get('market_cap', 0)
-                        })
+            # Fetch each symbol's quote and fundamentals concurrently, keeping watchlist order
+            with ThreadPoolExecutor(max_workers=min(16, len(self.watchlist))) as executor:
+                quotes = list(executor.map(self._watchlist_quote, self.watchlist))
             
-            return watchlist_data
+            return [quote for quote in quotes if quote is not None]
             
         except Exception as e:
             print(f"Error getting watchlist data: {e}")
@@ -6,6 +6,7 @@ from datetime import datetime, timedelta
 import concurrent.futures
 from .fundamentals import get_fundamental_data, calculate_financial_score
 from .market_data import calculate_technical_indicators, get_stock_data
+from ._njit import njit
 
 # Common Indian stock universe
 INDIAN_STOCKS = [
@@ -19,6 +20,38 @@ INDIAN_STOCKS = [
     'PIDILITIND', 'GODREJCP', 'MARICO', 'DABUR'
 ]
 
+@njit(cache=True)
+def _supertrend_kernel(close, upper, lower, final_upper, final_lower, trend, direction):
+    """Final-band and trend state machine for Supertrend over raw arrays"""
+    n = len(close)
+    final_upper[0] = upper[0]
+    final_lower[0] = lower[0]
+    for i in range(1, n):
+        # A NaN previous band (ATR warm-up) resets to the current band
+        if np.isnan(final_upper[i-1]) or upper[i] < final_upper[i-1] or close[i-1] > final_upper[i-1]:
+            final_upper[i] = upper[i]
+        else:
+            final_upper[i] = final_upper[i-1]
+
+        if np.isnan(final_lower[i-1]) or lower[i] > final_lower[i-1] or close[i-1] < final_lower[i-1]:
+            final_lower[i] = lower[i]
+        else:
+            final_lower[i] = final_lower[i-1]
+
+    direction[0] = 1 if close[0] > final_upper[0] else -1
+    trend[0] = final_lower[0] if direction[0] == 1 else final_upper[0]
+    for i in range(1, n):
+        if close[i] > final_upper[i]:
+            trend[i] = final_lower[i]
+            direction[i] = 1
+        elif close[i] < final_lower[i]:
+            trend[i] = final_upper[i]
+            direction[i] = -1
+        else:
+            # Keep the previous direction and follow its current band
+            direction[i] = direction[i-1]
+            trend[i] = final_lower[i] if direction[i] == 1 else final_upper[i]
+
 class StockScreener:
     def __init__(self):
         self.stock_universe = INDIAN_STOCKS
@@ -248,39 +281,21 @@ class StockScreener:
             upper_band = hl_avg + (multiplier * atr)
             lower_band = hl_avg - (multiplier * atr)
             
-            # Calculate final upper and lower bands
-            final_upper = upper_band.copy()
-            final_lower = lower_band.copy()
-            
-            for i in range(1, len(data)):
-                if upper_band.iloc[i] < final_upper.iloc[i-1] or close.iloc[i-1] > final_upper.iloc[i-1]:
-                    final_upper.iloc[i] = upper_band.iloc[i]
-                else:
-                    final_upper.iloc[i] = final_upper.iloc[i-1]
-                
-                if lower_band.iloc[i] > final_lower.iloc[i-1] or close.iloc[i-1] < final_lower.iloc[i-1]:
-                    final_lower.iloc[i] = lower_band.iloc[i]
-                else:
-                    final_lower.iloc[i] = final_lower.iloc[i-1]
-            
-            # Determine Supertrend and signals
-            supertrend = pd.Series(index=data.index, dtype=float)
-            signal = pd.Series(index=data.index, dtype=str)
-            
-            # Initial values
-            supertrend.iloc[0] = final_lower.iloc[0] if close.iloc[0] > final_upper.iloc[0] else final_upper.iloc[0]
-            signal.iloc[0] = 'Buy' if close.iloc[0] > final_upper.iloc[0] else 'Sell'
-            
-            for i in range(1, len(data)):
-                if close.iloc[i] > final_upper.iloc[i]:
-                    supertrend.iloc[i] = final_lower.iloc[i]
-                    signal.iloc[i] = 'Buy'
-                elif close.iloc[i] < final_lower.iloc[i]:
-                    supertrend.iloc[i] = final_upper.iloc[i]
-                    signal.iloc[i] = 'Sell'
-                else:
-                    supertrend.iloc[i] = supertrend.iloc[i-1]
-                    signal.iloc[i] = signal.iloc[i-1]
+            # Calculate final bands, Supertrend and signals in one compiled pass
+            n = len(data)
+            final_upper = np.empty(n)
+            final_lower = np.empty(n)
+            trend = np.empty(n)
+            direction = np.empty(n, dtype=np.int64)
+            _supertrend_kernel(close.to_numpy(dtype=np.float64),
+                               upper_band.to_numpy(dtype=np.float64),
+                               lower_band.to_numpy(dtype=np.float64),
+                               final_upper, final_lower, trend, direction)
+            
+            supertrend = pd.Series(trend, index=data.index)
+            signal = pd.Series(np.where(direction == 1, 'Buy', 'Sell'), index=data.index)
+            final_upper = pd.Series(final_upper, index=data.index)
+            final_lower = pd.Series(final_lower, index=data.index)
             
             result = pd.DataFrame({
                 'Supertrend': supertrend,